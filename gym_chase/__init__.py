@@ -1,10 +1,27 @@
-"""Root `__init__` of the gym-chase module."""
-from gymnasium.envs.registration import register
+"""Root `__init__` of the gym-chase module.
 
-# Toy Text
-# ----------------------------------------
+Environments are registered by gymnasium itself: the ``gymnasium.envs`` entry
+point runs ``register_envs`` when gymnasium is imported. Importing gym_chase
+only registers them when gymnasium was imported first, so the game engine in
+``gym_chase.envs.chase_core`` imports without loading gymnasium at all.
+"""
+import sys
 
-register(
-    id="Chase-v1",
-    entry_point="gym_chase.envs:ChaseEnv",
-)
+
+def register_envs() -> None:
+    """Registers the gym-chase environments with gymnasium, once."""
+    from gymnasium.envs.registration import register, registry
+
+    # Toy Text
+    # ----------------------------------------
+
+    if "Chase-v1" not in registry:
+        register(
+            id="Chase-v1",
+            entry_point="gym_chase.envs:ChaseEnv",
+        )
+
+
+# Covers gymnasium imported first from a tree without the entry point installed.
+if sys.modules.get("gymnasium") is not None:
+    register_envs()
@@ -0,0 +1,175 @@
+"""Precomputed bank of seeded gym-chase arenas.
+
+Entry ``i`` of a bank is the arena ``ChaseEnv.reset(seed=i)`` generates,
+stored as packed coordinates in a ``.npy`` file. ``ChaseEnv(arena_bank=path)``
+memory maps the file and resets by slicing it, so no arena is generated and
+every process resetting from the same bank shares one copy in the page cache.
+Build a bank from the command line with:
+```
+> python -m gym_chase.arena_bank arenas.npy 1000000
+```
+"""
+import argparse
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from gym_chase.envs.chase_core import (
+    ARENA_VERSION,
+    arena_keys,
+    check_arena_size,
+    coordinate_dtype,
+    generate_arenas,
+)
+
+# Bytes of arenas each build_bank job generates by default.
+_CHUNK_BYTES = 1 << 18
+
+# Title of the agent field, which records the arena generator version and the
+# arena size in the header.
+_TITLE = "arena generator v{} size {}"
+_TITLE_PATTERN = re.compile(_TITLE.format(r"(\d+)", r"(\d+)"))
+
+
+def bank_dtype(size: int = 20, robots: int = 5, zappers: int = 10) -> np.dtype:
+    """Returns the record type of one bank entry.
+
+    Coordinates are int8 for arenas up to size 127 and int16 above that. The
+    arena generator version and arena size are the title of the agent field
+    and the robot and zapper counts are the shapes of their fields, so all of
+    them are stored in the ``.npy`` header.
+    """
+    coord = coordinate_dtype(size)
+    return np.dtype(
+        {
+            "names": ["agent", "robots", "zappers"],
+            "formats": [(coord, (2,)), (coord, (robots, 2)), (coord, (zappers, 2))],
+            "titles": [_TITLE.format(ARENA_VERSION, size), None, None],
+        }
+    )
+
+
+def _fill(path: str, start: int, stop: int, size: int) -> None:
+    """Generates the arenas for seeds start to stop into an open bank file."""
+    bank = np.load(path, mmap_mode="r+")
+    robots, zappers = bank_shape(bank)
+    chunk = np.empty(stop - start, dtype=bank.dtype)
+    chunk["agent"], chunk["robots"], chunk["zappers"] = generate_arenas(
+        arena_keys(np.arange(start, stop)), size, robots, zappers
+    )
+    bank[start:stop] = chunk
+    bank.flush()
+
+
+def build_bank(
+    path: str,
+    count: int,
+    size: int = 20,
+    robots: int = 5,
+    zappers: int = 10,
+    workers: Optional[int] = None,
+    chunk: Optional[int] = None,
+) -> np.memmap:
+    """Generates the arenas for seeds 0 to count - 1 into a bank file.
+
+    Args:
+        path: ``.npy`` file to write.
+        count: number of seeds.
+        size: width and height of the arenas including the boundary.
+        robots: number of robots.
+        zappers: number of free standing zappers.
+        workers: number of worker processes, defaults to the CPU count.
+        chunk: number of seeds generated by each job, by default as many as
+            fill 256 KB of the bank.
+
+    Returns:
+        The bank, memory mapped read only.
+    """
+    check_arena_size(size, robots, zappers)
+    dtype = bank_dtype(size, robots, zappers)
+    if chunk is None:
+        chunk = max(1, _CHUNK_BYTES // dtype.itemsize)
+    bank = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(count,))
+    del bank
+    with ProcessPoolExecutor(workers) as executor:
+        jobs = [
+            executor.submit(_fill, path, start, min(start + chunk, count), size)
+            for start in range(0, count, chunk)
+        ]
+        for job in jobs:
+            job.result()
+    return load_bank(path)
+
+
+def load_bank(path: str) -> np.memmap:
+    """Memory maps a bank file read only."""
+    return np.load(path, mmap_mode="r")
+
+
+def bank_shape(bank: np.ndarray) -> Tuple[int, int]:
+    """Returns the number of (robots, zappers) in the arenas of a bank."""
+    return bank.dtype["robots"].shape[0], bank.dtype["zappers"].shape[0]
+
+
+def bank_header(bank: np.ndarray) -> Tuple[Optional[int], Optional[int]]:
+    """Returns the (arena generator version, arena size) recorded by a bank.
+
+    Both are None if its header does not record them.
+    """
+    match = _TITLE_PATTERN.fullmatch(bank.dtype.fields["agent"][2] or "")
+    return (int(match.group(1)), int(match.group(2))) if match else (None, None)
+
+
+def check_bank(bank: np.ndarray, size: int, robots: int, zappers: int) -> None:
+    """Raises ValueError unless a bank holds arenas of the given shape.
+
+    Args:
+        bank: an arena bank.
+        size: width and height of the arenas including the boundary.
+        robots: number of robots.
+        zappers: number of free standing zappers.
+    """
+    version, size_held = bank_header(bank)
+    if version is None:
+        raise ValueError("Arena bank does not record its arena generator, rebuild it.")
+    if version != ARENA_VERSION:
+        raise ValueError(
+            f"Arena bank was built by arena generator version {version}, "
+            f"expected {ARENA_VERSION}, rebuild it."
+        )
+    if size_held != size:
+        raise ValueError(f"Arena bank holds size {size_held} arenas, expected {size}.")
+    robots_held, zappers_held = bank_shape(bank)
+    if (robots_held, zappers_held) != (robots, zappers):
+        raise ValueError(
+            f"Arena bank holds {robots_held} robots and {zappers_held} zappers, "
+            f"expected {robots} and {zappers}."
+        )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Build an arena bank from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help=".npy file to write")
+    parser.add_argument("count", type=int, help="number of seeds, from 0")
+    parser.add_argument("--size", type=int, default=20)
+    parser.add_argument("--robots", type=int, default=5)
+    parser.add_argument("--zappers", type=int, default=10)
+    parser.add_argument("--workers", type=int, help="number of worker processes")
+    args = parser.parse_args(argv)
+
+    bank = build_bank(
+        args.path,
+        args.count,
+        size=args.size,
+        robots=args.robots,
+        zappers=args.zappers,
+        workers=args.workers,
+    )
+    print(f"{len(bank)} arenas, {bank.nbytes} bytes, written to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""Throughput benchmarks for the gym-chase environments.
+
+Measures reset latency, real and projected step throughput, render cost,
+the time spent in each phase of step, reset and render, vector env scaling
+over the number of arenas and scaling over arena size and robot count. Every
+benchmark uses fixed seeds so runs can be compared between releases. Run from
+the command line with:
+```
+> chase-bench --output bench.json
+```
+or ``python -m gym_chase.bench``.
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from gym_chase.envs import ChaseEnv, ChaseVectorEnv
+
+# (size, robots, zappers) arenas with the default density of robots and zappers.
+SCALING_ARENAS = [(20, 5, 10), (64, 50, 100), (128, 200, 400), (256, 800, 1600)]
+
+# Robot counts stepped in a 64x64 arena with 100 zappers.
+SCALING_ROBOTS = [5, 25, 100, 400]
+
+# Number of arenas stepped by the vector env scaling benchmark.
+SCALING_NUM_ENVS = [1, 16, 256, 4096]
+
+
+def reset_latency(resets: int = 5000, seed: int = 0, **env_kwargs) -> float:
+    """Returns the mean ChaseEnv.reset time in microseconds."""
+    env = ChaseEnv(**env_kwargs)
+    env.reset(seed=seed)
+
+    start = time.perf_counter()
+    for _ in range(resets):
+        env.reset()
+    return (time.perf_counter() - start) / resets * 1e6
+
+
+def env_steps_per_sec(
+    size: int = 20,
+    robots: int = 5,
+    zappers: int = 10,
+    steps: int = 2000,
+    seed: int = 0,
+    project: bool = False,
+    **env_kwargs,
+) -> float:
+    """Returns ChaseEnv steps per second taking random actions.
+
+    Episodes are reset as they end and the reset time is included. With
+    ``project`` every action is projected from the current state before the
+    real step is taken and only the projections are counted.
+    """
+    env = ChaseEnv(size=size, robots=robots, zappers=zappers, **env_kwargs)
+    actions = np.random.default_rng(seed).integers(0, 9, size=steps).tolist()
+    env.reset(seed=seed)
+
+    if project:
+        # Nine projections are timed for each real step.
+        actions = actions[: max(1, steps // 9)]
+        start = time.perf_counter()
+        for action in actions:
+            for projected in range(9):
+                env.step(projected, project=True)
+            _, _, terminated, _, _ = env.step(action)
+            if terminated:
+                env.reset()
+        return len(actions) * 9 / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for action in actions:
+        _, _, terminated, _, _ = env.step(action)
+        if terminated:
+            env.reset()
+    return steps / (time.perf_counter() - start)
+
+
+def render_cost(renders: int = 500, seed: int = 0, render_mode: str = "ansi") -> float:
+    """Returns the mean ChaseEnv.render time in microseconds."""
+    env = ChaseEnv(render_mode=render_mode)
+    env.reset(seed=seed)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for _ in range(renders):
+            env.render()
+        elapsed = time.perf_counter() - start
+    return elapsed / renders * 1e6
+
+
+def phases(steps: int = 2000, seed: int = 0) -> Dict[str, dict]:
+    """Returns the ChaseEnv.stats() time breakdown of a profiled run.
+
+    Each random step is preceded by nine projections and a render, and
+    episodes are reset as they end.
+    """
+    env = ChaseEnv(render_mode="ansi", profile=True)
+    actions = np.random.default_rng(seed).integers(0, 9, size=steps).tolist()
+    env.reset(seed=seed)
+    for action in actions:
+        for projected in range(9):
+            env.step(projected, project=True)
+        env.render()
+        _, _, terminated, _, _ = env.step(action)
+        if terminated:
+            env.reset()
+    return env.stats()
+
+
+def vector_steps_per_sec(
+    size: int = 20,
+    robots: int = 5,
+    zappers: int = 10,
+    num_envs: int = 64,
+    steps: int = 200,
+    seed: int = 0,
+) -> float:
+    """Returns ChaseVectorEnv arena steps per second taking random actions."""
+    env = ChaseVectorEnv(num_envs, size=size, robots=robots, zappers=zappers)
+    actions = np.random.default_rng(seed).integers(0, 9, size=(steps, num_envs))
+    env.reset(seed=seed)
+
+    start = time.perf_counter()
+    for batch in actions:
+        env.step(batch)
+    return steps * num_envs / (time.perf_counter() - start)
+
+
+def vector_scaling(
+    num_envs: Sequence[int] = tuple(SCALING_NUM_ENVS), steps: int = 200
+) -> List[Dict[str, float]]:
+    """Measures vector env arena steps per second for each number of arenas."""
+    return [
+        {"num_envs": n, "steps_per_sec": vector_steps_per_sec(num_envs=n, steps=steps)}
+        for n in num_envs
+    ]
+
+
+def scaling(
+    arenas: Sequence[Tuple[int, int, int]] = tuple(SCALING_ARENAS)
+    + tuple((64, r, 100) for r in SCALING_ROBOTS),
+    steps: int = 2000,
+) -> List[Dict[str, float]]:
+    """Measures single and vector env steps per second for each arena."""
+    results = []
+    for size, robots, zappers in arenas:
+        results.append(
+            {
+                "size": size,
+                "robots": robots,
+                "zappers": zappers,
+                "env_steps_per_sec": env_steps_per_sec(
+                    size, robots, zappers, steps=steps
+                ),
+                "vector_steps_per_sec": vector_steps_per_sec(
+                    size, robots, zappers, steps=max(1, steps // 10)
+                ),
+            }
+        )
+    return results
+
+
+def run(quick: bool = False) -> dict:
+    """Runs every benchmark and returns the results as a JSON ready dict.
+
+    Args:
+        quick: run far fewer iterations, for smoke tests rather than numbers.
+    """
+    scale = 20 if quick else 1
+    results = {
+        "reset_us": reset_latency(resets=5000 // scale),
+        "step_per_sec": env_steps_per_sec(steps=20000 // scale),
+        "project_per_sec": env_steps_per_sec(steps=20000 // scale, project=True),
+        "render_us": render_cost(renders=500 // scale),
+        "render_rgb_us": render_cost(renders=500 // scale, render_mode="rgb_array"),
+        "phases": phases(steps=2000 // scale),
+    }
+    if quick:
+        results["vector_scaling"] = vector_scaling(SCALING_NUM_ENVS[:2], steps=10)
+        results["scaling"] = scaling(SCALING_ARENAS[:2], steps=100)
+    else:
+        results["vector_scaling"] = vector_scaling()
+        results["scaling"] = scaling()
+    return {
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "results": results,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Run the benchmarks, print a summary and optionally write JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument(
+        "--quick", action="store_true", help="run a fast smoke test of every benchmark"
+    )
+    args = parser.parse_args(argv)
+
+    report = run(quick=args.quick)
+    results = report["results"]
+    print(f"reset      {results['reset_us']:>10.1f} us")
+    print(f"step       {results['step_per_sec']:>10.0f} /s")
+    print(f"project    {results['project_per_sec']:>10.0f} /s")
+    print(f"render     {results['render_us']:>10.1f} us")
+    print(f"render rgb {results['render_rgb_us']:>10.1f} us")
+    print(f"{'phase':<20} {'calls':>8} {'mean us':>10}")
+    for phase, row in results["phases"].items():
+        print(f"{phase:<20} {row['calls']:>8} {row['mean_us']:>10.2f}")
+    print(f"{'num_envs':>8} {'vector/s':>10}")
+    for row in results["vector_scaling"]:
+        print(f"{row['num_envs']:>8} {row['steps_per_sec']:>10.0f}")
+    print(f"{'size':>6} {'robots':>7} {'zappers':>8} {'env/s':>10} {'vector/s':>10}")
+    for row in results["scaling"]:
+        print(
+            f"{row['size']:>6} {row['robots']:>7} {row['zappers']:>8} "
+            f"{row['env_steps_per_sec']:>10.0f} {row['vector_steps_per_sec']:>10.0f}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
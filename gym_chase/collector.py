@@ -0,0 +1,295 @@
+"""Multiprocess rollout collector for gym-chase using shared memory.
+
+Worker processes each run a slice of ``ChaseEnv`` instances in the "flat"
+observation mode and write actions, observations, rewards and terminated
+flags straight into a ``multiprocessing.shared_memory`` ring buffer. Only
+short commands travel through pipes, so the learner reads every result in
+place without pickling observations.
+
+The ring buffer has ``horizon`` slots. Slot ``t`` holds the action taken,
+the observation reached, the reward and the terminated flag of one step for
+every env. Terminated envs are reset straight away and the slot holds the
+first observation of the new episode.
+"""
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from typing import Callable, Dict
+
+import numpy as np
+
+from gym_chase.envs import ChaseEnv
+
+# Ring buffer arrays in the order they are laid out in shared memory.
+_FIELDS = ("actions", "obs", "rewards", "terminated")
+
+
+def _buffers(buf, horizon: int, num_envs: int, obs_dim: int) -> Dict[str, np.ndarray]:
+    """Returns the ring buffer arrays laid out over a shared memory buffer."""
+    specs = {
+        "actions": ((horizon, num_envs), np.int64),
+        "obs": ((horizon, num_envs, obs_dim), np.int32),
+        "rewards": ((horizon, num_envs), np.int32),
+        "terminated": ((horizon, num_envs), np.bool_),
+    }
+    arrays = {}
+    offset = 0
+    for name in _FIELDS:
+        shape, dtype = specs[name]
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=buf, offset=offset)
+        # Keep every array 8 byte aligned.
+        offset += -(-arrays[name].nbytes // 8) * 8
+    return arrays
+
+
+def _buffer_size(horizon: int, num_envs: int, obs_dim: int) -> int:
+    """Returns the number of bytes the ring buffer needs."""
+    sizes = [horizon * num_envs * 8, horizon * num_envs * obs_dim * 4]
+    sizes += [horizon * num_envs * 4, horizon * num_envs]
+    return sum(-(-size // 8) * 8 for size in sizes)
+
+
+def random_policy(obs: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Returns a uniformly random action for each observation."""
+    return rng.integers(0, 9, size=len(obs))
+
+
+def _serve(conn, arrays: Dict[str, np.ndarray], envs: list, start: int, policy) -> None:
+    """Answers commands for the envs from start until told to close."""
+    actions, obs = arrays["actions"], arrays["obs"]
+    rewards, terminated = arrays["rewards"], arrays["terminated"]
+    stop = start + len(envs)
+    rng = np.random.default_rng(start)
+
+    def step(slot: int) -> None:
+        for i, env in enumerate(envs, start):
+            observation, reward, done, _, _ = env.step(actions[slot, i])
+            if done:
+                observation, _ = env.reset()
+            obs[slot, i] = observation
+            rewards[slot, i] = reward
+            terminated[slot, i] = done
+
+    while True:
+        command, arg = conn.recv()
+        if command == "reset":
+            slot, seed = arg
+            rng = np.random.default_rng([seed, start])
+            for i, env in enumerate(envs, start):
+                obs[slot, i], _ = env.reset(seed=seed + i)
+            rewards[slot, start:stop] = 0
+            terminated[slot, start:stop] = False
+        elif command == "step":
+            step(arg)
+        elif command == "rollout":
+            first, steps = arg
+            if first != 0:
+                obs[0, start:stop] = obs[first, start:stop]
+            for slot in range(1, steps + 1):
+                actions[slot, start:stop] = policy(obs[slot - 1, start:stop], rng)
+                step(slot)
+        elif command == "close":
+            return
+        conn.send(None)
+
+
+def _worker(
+    conn,
+    shm_name: str,
+    horizon: int,
+    num_envs: int,
+    obs_dim: int,
+    start: int,
+    stop: int,
+    env_kwargs: dict,
+    policy: Callable,
+) -> None:
+    """Runs envs start to stop in a worker process of ChaseCollector."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        envs = [ChaseEnv(obs_mode="flat", **env_kwargs) for _ in range(start, stop)]
+        _serve(conn, _buffers(shm.buf, horizon, num_envs, obs_dim), envs, start, policy)
+    finally:
+        shm.close()
+
+
+class ChaseCollector:
+    """Collects Chase rollouts from worker processes through shared memory.
+
+    There are two ways to collect:
+        - ``step(actions)`` steps every env once with actions chosen by the
+          learner and returns views of the new ring buffer slot; and
+        - ``rollout(steps)`` has the workers choose actions with ``policy`` for
+          a fixed horizon without waiting on the learner. ``start_rollout`` and
+          ``wait`` split this so the learner can work while it runs.
+
+    The arrays returned are views of shared memory. They stay valid until the
+    ring buffer wraps around to the same slot or the collector is closed.
+
+    Example:
+        >>> with ChaseCollector(num_workers=4, envs_per_worker=16) as collector:
+        ...     obs = collector.reset(seed=0)
+        ...     batch = collector.rollout(64)
+    """
+
+    def __init__(
+        self,
+        num_workers: int = 2,
+        envs_per_worker: int = 8,
+        horizon: int = 128,
+        policy: Callable = random_policy,
+        **env_kwargs,
+    ) -> None:
+        """Start the worker processes and allocate the ring buffer.
+
+        Args:
+            num_workers: number of worker processes.
+            envs_per_worker: number of ChaseEnv instances run by each worker.
+            horizon: number of slots in the ring buffer.
+            policy: picklable function mapping a (envs, obs_dim) batch of flat
+                observations and a numpy Generator to actions, used by rollout.
+            **env_kwargs: passed to every ChaseEnv, e.g. size or robots.
+        """
+        if horizon < 2:
+            raise ValueError(f"horizon must be at least 2, got {horizon}.")
+        self.num_workers = num_workers
+        self.num_envs = num_workers * envs_per_worker
+        self.horizon = horizon
+        self.obs_dim = ChaseEnv(obs_mode="flat", **env_kwargs).observation_space.shape[
+            0
+        ]
+
+        self._shm = shared_memory.SharedMemory(
+            create=True, size=_buffer_size(horizon, self.num_envs, self.obs_dim)
+        )
+        self.buffers = _buffers(self._shm.buf, horizon, self.num_envs, self.obs_dim)
+        self._slot = 0
+        self._pending = False
+        self._rollout_steps = 0
+
+        self._conns = []
+        self._processes = []
+        for w in range(num_workers):
+            parent, child = mp.Pipe()
+            process = mp.Process(
+                target=_worker,
+                args=(
+                    child,
+                    self._shm.name,
+                    horizon,
+                    self.num_envs,
+                    self.obs_dim,
+                    w * envs_per_worker,
+                    (w + 1) * envs_per_worker,
+                    env_kwargs,
+                    policy,
+                ),
+                daemon=True,
+            )
+            process.start()
+            child.close()
+            self._conns.append(parent)
+            self._processes.append(process)
+        self.closed = False
+
+    def _check_idle(self) -> None:
+        """Raises RuntimeError if the workers are still running a rollout."""
+        if self._pending:
+            raise RuntimeError("Call wait() to finish the running rollout first.")
+
+    def _send(self, command: str, arg=None) -> None:
+        """Sends a command to every worker."""
+        self._check_idle()
+        for conn in self._conns:
+            conn.send((command, arg))
+        self._pending = True
+
+    def _wait(self) -> None:
+        """Waits until every worker has finished its command."""
+        for conn in self._conns:
+            conn.recv()
+        self._pending = False
+
+    def reset(self, seed: int = 0) -> np.ndarray:
+        """Resets env ``i`` with ``seed + i`` and returns the (envs, obs_dim) observations."""
+        self._send("reset", (self._slot, seed))
+        self._wait()
+        return self.buffers["obs"][self._slot]
+
+    def step(self, actions: np.ndarray):
+        """Steps every env with actions and returns views of the new slot.
+
+        Returns:
+            A tuple of (obs, rewards, terminated) with shapes (envs, obs_dim),
+            (envs,) and (envs,).
+        """
+        # Check before writing to shared memory a running rollout may be using.
+        self._check_idle()
+        slot = (self._slot + 1) % self.horizon
+        self.buffers["actions"][slot] = actions
+        self._send("step", slot)
+        self._wait()
+        self._slot = slot
+        return (
+            self.buffers["obs"][slot],
+            self.buffers["rewards"][slot],
+            self.buffers["terminated"][slot],
+        )
+
+    def start_rollout(self, steps: int) -> None:
+        """Starts the workers on a rollout of steps with their policy.
+
+        The current observations are moved to slot 0 and the rollout fills
+        slots 1 to steps. Call ``wait`` for the results.
+        """
+        if not 0 < steps < self.horizon:
+            raise ValueError(f"steps must be between 1 and {self.horizon - 1}.")
+        self._send("rollout", (self._slot, steps))
+        self._rollout_steps = steps
+
+    def wait(self) -> Dict[str, np.ndarray]:
+        """Waits for the running rollout and returns views of its slots.
+
+        Returns:
+            A Dict of "obs" (steps + 1, envs, obs_dim) starting with the
+            observations the rollout began from, and "actions", "rewards" and
+            "terminated" of shape (steps, envs).
+        """
+        if not self._pending:
+            raise RuntimeError("No rollout is running, call start_rollout() first.")
+        self._wait()
+        steps = self._rollout_steps
+        self._slot = steps
+        batch = {"obs": self.buffers["obs"][: steps + 1]}
+        for name in ("actions", "rewards", "terminated"):
+            batch[name] = self.buffers[name][1 : steps + 1]
+        return batch
+
+    def rollout(self, steps: int) -> Dict[str, np.ndarray]:
+        """Runs a rollout of steps with the workers' policy, see ``wait``."""
+        self.start_rollout(steps)
+        return self.wait()
+
+    def close(self) -> None:
+        """Stops the workers and frees the shared memory."""
+        if self.closed:
+            return
+        if self._pending:
+            self._wait()
+        for conn in self._conns:
+            conn.send(("close", None))
+        for process in self._processes:
+            process.join()
+        for conn in self._conns:
+            conn.close()
+        self.buffers = None
+        self._shm.close()
+        self._shm.unlink()
+        self.closed = True
+
+    def __enter__(self) -> "ChaseCollector":
+        """Returns the collector for use in a with statement."""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Closes the collector."""
+        self.close()
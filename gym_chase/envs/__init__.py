@@ -1,2 +1,45 @@
-"""Import Chase environment for game."""
-from gym_chase.envs.chase_env import ChaseEnv
+"""Import Chase environment for game.
+
+Names are imported on first use (PEP 562), so importing the game engine in
+``gym_chase.envs.chase_core`` does not load gymnasium or the environments.
+"""
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from gym_chase.envs.chase_core import (
+        ChaseState,
+        TransitionCache,
+        chase_transition,
+        decode_state,
+        encode_state,
+    )
+    from gym_chase.envs.chase_env import ChaseEnv
+    from gym_chase.envs.chase_vector_env import ChaseVectorEnv
+
+# Module each public name is imported from.
+_EXPORTS = {
+    "ChaseState": "gym_chase.envs.chase_core",
+    "TransitionCache": "gym_chase.envs.chase_core",
+    "chase_transition": "gym_chase.envs.chase_core",
+    "decode_state": "gym_chase.envs.chase_core",
+    "encode_state": "gym_chase.envs.chase_core",
+    "ChaseEnv": "gym_chase.envs.chase_env",
+    "ChaseVectorEnv": "gym_chase.envs.chase_vector_env",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    """Imports a public name from its module on first use."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """Lists the public names alongside the module attributes."""
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,813 @@
+"""Array based game engine shared by the gym-chase environments."""
+from collections import OrderedDict
+from functools import lru_cache
+from time import perf_counter
+from typing import Hashable, Optional, Tuple
+
+import numpy as np
+
+# Codes of the walls grid.
+EMPTY = 0
+BOUNDARY = 1
+ZAPPER = 2
+
+# Row ``a`` is the (x, y) move for action ``a``. Matches ChaseEnv.action_to_direction.
+ACTION_TO_DIRECTION = np.array(
+    [
+        [1, -1],
+        [1, 0],
+        [1, 1],
+        [0, -1],
+        [0, 0],
+        [0, 1],
+        [-1, -1],
+        [-1, 0],
+        [-1, 1],
+    ],
+    dtype=np.int32,
+)
+
+# (x, y) move for each action as plain ints for the scalar step.
+_DIRECTIONS = ACTION_TO_DIRECTION.tolist()
+
+# Version of the arena generator. Arena banks and solver caches record it, so
+# arenas from an older generator are never mistaken for the current ones.
+ARENA_VERSION = 3
+
+# Golden ratio increment between the counters of a splitmix64 random stream,
+# and an odd multiplier spreading seeds apart before they are hashed into keys.
+_STREAM_STEP = 0x9E3779B97F4A7C15
+_SEED_STEP = 0xD1B54A32D192ED03
+_MASK64 = 2**64 - 1
+_STEPS = np.array([_SEED_STEP, _STREAM_STEP], dtype=np.uint64)
+_SHIFTS = np.array([30, 27, 31], dtype=np.uint64)
+_MULTIPLIERS = np.array([0xBF58476D1CE4E5B9, 0x94D049BB133111EB], dtype=np.uint64)
+
+# Most stream draws generate_arenas holds at once, about 2 MB per work array.
+_DRAW_BUDGET = 1 << 18
+
+
+def check_arena_size(size: int, robots: int, zappers: int) -> None:
+    """Raises ValueError if the robots, zappers and agent do not fit in the arena."""
+    if size < 3:
+        raise ValueError(f"Arena size must be at least 3, got {size}.")
+    if robots < 0 or zappers < 0:
+        raise ValueError("The number of robots and zappers can not be negative.")
+    if robots + zappers + 1 > (size - 2) ** 2:
+        raise ValueError(
+            f"{robots} robots, {zappers} zappers and the agent do not fit in the "
+            f"{(size - 2) ** 2} interior squares of a size {size} arena."
+        )
+
+
+def coordinate_dtype(size: int) -> np.dtype:
+    """Returns the smallest integer type packed coordinates of an arena fit in.
+
+    Coordinates range from -1 to size, the agent can leave the arena on the
+    step that ends an episode.
+    """
+    return np.dtype(np.int8 if size <= 127 else np.int16)
+
+
+def _mix64(x: np.ndarray) -> np.ndarray:
+    """Returns the splitmix64 finalizer of a uint64 array, a well spread hash."""
+    shift_a, shift_b, shift_c = _SHIFTS
+    x = (x ^ (x >> shift_a)) * _MULTIPLIERS[0]
+    x = (x ^ (x >> shift_b)) * _MULTIPLIERS[1]
+    return x ^ (x >> shift_c)
+
+
+def stream_key(seed: int, episode: int = 0) -> int:
+    """Returns the key of the random stream for episode of seed.
+
+    Streams are counter based: draw ``i`` of a stream is a hash of its key and
+    ``i``, so any draw of any stream is computed directly, with no generator
+    state to seed or advance. This is the scalar form of ``arena_keys``.
+    """
+    x = (seed * _SEED_STEP + episode * _STREAM_STEP) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+def arena_keys(seeds, episodes=0) -> np.ndarray:
+    """Returns the (N,) uint64 stream keys of seeds and episodes, see stream_key."""
+    seeds = np.atleast_1d(np.asarray(seeds)).astype(np.uint64)
+    episodes = np.atleast_1d(np.asarray(episodes)).astype(np.uint64)
+    return _mix64(seeds * _STEPS[0] + episodes * _STEPS[1])
+
+
+def generate_arenas(
+    keys: np.ndarray, size: int = 20, robots: int = 5, zappers: int = 10
+):
+    """Draws the arena of each random stream in one vectorized call.
+
+    Draw ``i`` of a stream picks an interior square and repeats of an earlier
+    pick are skipped, so the zappers, robots and agent take the first distinct
+    squares in that order, a uniform sample without replacement. The work
+    grows with the number of pieces placed, not with the arena area, and keys
+    are taken in blocks so memory stays bounded for any batch. The arena of
+    ``stream_key(seed)`` is the one ``ChaseEnv.reset(seed=seed)`` uses.
+
+    Args:
+        keys: (N,) uint64 stream keys from arena_keys.
+        size: width and height of the arena including the boundary.
+        robots: number of robots.
+        zappers: number of free standing zappers.
+
+    Returns:
+        A tuple of (agents, robots, zappers) int32 arrays of shape (N, 2),
+        (N, robots, 2) and (N, zappers, 2).
+    """
+    area = (size - 2) ** 2
+    pieces = zappers + robots + 1
+    squares = _interior(size)
+    locations = np.empty((len(keys), pieces, 2), dtype=np.int32)
+    block = max(1, _DRAW_BUDGET // min(4 * pieces, area))
+    for start in range(0, len(keys), block):
+        cells = _sample_squares(keys[start : start + block], area, pieces)
+        locations[start : start + block] = squares[cells]
+    return (
+        locations[:, zappers + robots],
+        locations[:, zappers : zappers + robots],
+        locations[:, :zappers],
+    )
+
+
+def _sample_squares(keys: np.ndarray, area: int, pieces: int) -> np.ndarray:
+    """Returns the (N, pieces) first distinct squares drawn by each stream.
+
+    Draw ``i`` of a stream is scaled onto ``area`` squares. When the pieces
+    fill more than half the squares, skipping repeats wastes most draws, so
+    every square gets one draw instead and the squares with the smallest
+    draws are taken, which is also a uniform sample without replacement.
+    """
+    if 2 * pieces > area:
+        draws = _mix64(keys[:, None] + _counters(area))
+        return draws.argsort(axis=1)[:, :pieces]
+
+    # Draws expected to hold the pieces with a margin, doubled for the rare
+    # streams that repeat too often. A stream's first distinct squares do not
+    # depend on how many draws are taken, so arenas are the same either way.
+    count = pieces + pieces * pieces // area + 8
+    cells = np.empty((len(keys), pieces), dtype=np.int64)
+    todo = np.arange(len(keys))
+    while len(todo):
+        draws = _mix64(keys[todo, None] + _counters(count))
+        squares = ((draws >> np.uint64(32)) * np.uint64(area)) >> np.uint64(32)
+
+        # Sort draws by square then draw number to find the first draw of each
+        # square, then sort the draw numbers of those to restore draw order.
+        ranked = np.sort(squares * np.uint64(count) + _draw_numbers(count), axis=1)
+        ranked_squares = ranked // np.uint64(count)
+        draw = ranked - ranked_squares * np.uint64(count)
+        draw[:, 1:][ranked_squares[:, 1:] == ranked_squares[:, :-1]] = count
+        draw = np.sort(draw, axis=1)[:, :pieces]
+
+        done = draw[:, -1] < count
+        cells[todo[done]] = np.take_along_axis(
+            squares[done], draw[done].astype(np.intp), axis=1
+        )
+        todo = todo[~done]
+        count *= 2
+    return cells
+
+
+def batch_step(
+    agents: np.ndarray,
+    robots: np.ndarray,
+    alive: np.ndarray,
+    blocked: np.ndarray,
+    occupied: np.ndarray,
+    actions: np.ndarray,
+):
+    """Advance a batch of arenas one step in place.
+
+    The rules are the same as ChaseEnv.step: the agent moves, then each live
+    robot in index order moves towards the agent unless another live robot
+    holds the target square, and robots moving onto a zapper or boundary are
+    eliminated.
+
+    Args:
+        agents: (N, 2) agent positions.
+        robots: (N, R, 2) robot positions.
+        alive: (N, R) bool robot alive flags.
+        blocked: (N, S, S) bool grid of boundary and zapper squares.
+        occupied: (N, S, S) bool grid of squares holding a live robot. Kept in
+            step with robots and alive.
+        actions: (N,) actions to apply.
+
+    Returns:
+        A tuple of (rewards, terminated) arrays of shape (N,).
+    """
+    n, size = blocked.shape[0], blocked.shape[1]
+    base = np.arange(n) * (size * size)
+    blocked_flat = blocked.reshape(-1)
+    occupied_flat = occupied.reshape(-1)
+
+    # All robots eliminated is judged on the state before the step.
+    no_robots = ~alive.any(axis=1)
+
+    # Move agent and check for a boundary, zapper or robot.
+    agents += ACTION_TO_DIRECTION[actions]
+    ax, ay = agents[:, 0], agents[:, 1]
+    inside = (ax >= 0) & (ax < size) & (ay >= 0) & (ay < size)
+    a_idx = base + np.clip(ax, 0, size - 1) * size + np.clip(ay, 0, size - 1)
+    eliminated = ~inside | blocked_flat[a_idx] | occupied_flat[a_idx]
+
+    kills = np.zeros(n, dtype=np.int64)
+    for j in range(robots.shape[1]):
+        active = alive[:, j]
+        rx, ry = robots[:, j, 0], robots[:, j, 1]
+
+        # Which way to the agent?
+        tar_x = ax - rx
+        tar_y = ay - ry
+        abs_x = np.abs(tar_x)
+        abs_y = np.abs(tar_y)
+        move_x = np.where(abs_x >= abs_y, np.sign(tar_x), 0)
+        move_y = np.where(abs_y >= abs_x, np.sign(tar_y), 0)
+
+        # Commit move if not moving onto another robot. Eliminated robots may
+        # lie on the boundary so only live ones look at their target square.
+        old_idx = base + rx * size + ry
+        new_idx = np.where(active, old_idx + move_x * size + move_y, old_idx)
+        moved = active & ~occupied_flat[new_idx]
+        occupied_flat[old_idx[moved]] = False
+        occupied_flat[new_idx[moved]] = True
+        rx += np.where(moved, move_x, 0)
+        ry += np.where(moved, move_y, 0)
+        pos_idx = np.where(moved, new_idx, old_idx)
+
+        # Has robot caught the agent?
+        eliminated |= active & (rx == ax) & (ry == ay)
+
+        # Has robot run into a zapper?
+        zapped = active & blocked_flat[pos_idx]
+        alive[zapped, j] = False
+        occupied_flat[pos_idx[zapped]] = False
+        kills += zapped
+
+    rewards = kills - eliminated
+    terminated = eliminated | no_robots
+
+    return rewards, terminated
+
+
+def batch_grids(robots: np.ndarray, alive: np.ndarray, zappers: np.ndarray, size: int):
+    """Returns the blocked and occupied grids batch_step needs for a batch of arenas.
+
+    Args:
+        robots: (N, R, 2) robot positions.
+        alive: (N, R) bool robot alive flags.
+        zappers: (N, Z, 2) zapper positions.
+        size: width and height of the arenas.
+
+    Returns:
+        A tuple of (blocked, occupied) bool arrays of shape (N, size, size).
+    """
+    n = len(robots)
+    blocked = np.zeros((n, size, size), dtype=bool)
+    blocked[:, [0, -1], :] = True
+    blocked[:, :, [0, -1]] = True
+    arena = np.arange(n)[:, None]
+    blocked[arena, zappers[:, :, 0], zappers[:, :, 1]] = True
+    occupied = np.zeros((n, size, size), dtype=bool)
+    arena = np.broadcast_to(arena, alive.shape)[alive]
+    occupied[arena, robots[alive][:, 0], robots[alive][:, 1]] = True
+    return blocked, occupied
+
+
+def robot_threats(
+    robots: np.ndarray, active: list, size: int, out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Returns a (size, size) bool map of the squares a live robot can reach next step.
+
+    Each live robot threatens the 3x3 box around it, as it moves straight onto
+    an agent within one square. Live robots are never on the boundary, so the
+    boxes stay inside the arena.
+
+    Args:
+        robots: (R, 2) robot positions.
+        active: indices of the live robots.
+        size: width and height of the arena.
+        out: optional (size, size) bool array to write the map into.
+    """
+    if out is None:
+        out = np.zeros((size, size), dtype=bool)
+    else:
+        out[:] = False
+    boxes = (robots[active][:, None, :] + ACTION_TO_DIRECTION).reshape(-1, 2)
+    out[boxes[:, 0], boxes[:, 1]] = True
+    return out
+
+
+def safe_actions(
+    agent: np.ndarray, walls: np.ndarray, threats: np.ndarray
+) -> np.ndarray:
+    """Returns a (9,) int8 mask of the actions the agent survives this step.
+
+    An action is safe if it leads to a square inside the arena that is not a
+    boundary or zapper and is not threatened by a robot. Squares holding a
+    robot are threatened by it.
+
+    Args:
+        agent: (2,) agent position.
+        walls: (size, size) grid of BOUNDARY, ZAPPER or EMPTY.
+        threats: (size, size) bool map from robot_threats.
+    """
+    size = walls.shape[0]
+    targets = agent + ACTION_TO_DIRECTION
+    inside = ((targets >= 0) & (targets < size)).all(axis=1)
+    x, y = np.clip(targets, 0, size - 1).T
+    return (inside & (walls[x, y] == EMPTY) & ~threats[x, y]).astype(np.int8)
+
+
+def batch_safe_actions(
+    agents: np.ndarray, blocked: np.ndarray, occupied: np.ndarray
+) -> np.ndarray:
+    """Returns an (N, 9) int8 mask of the actions each agent survives, see safe_actions.
+
+    Args:
+        agents: (N, 2) agent positions.
+        blocked: (N, S, S) bool grid of boundary and zapper squares.
+        occupied: (N, S, S) bool grid of squares holding a live robot.
+    """
+    n, size = blocked.shape[0], blocked.shape[1]
+    arena = np.arange(n)[:, None]
+    targets = agents[:, None, :] + ACTION_TO_DIRECTION
+    inside = ((targets >= 0) & (targets < size)).all(axis=2)
+    x, y = np.moveaxis(np.clip(targets, 0, size - 1), -1, 0)
+    safe = inside & ~blocked[arena, x, y]
+
+    # A target is threatened if the 3x3 box around it holds a live robot.
+    # Boxes of boundary targets are clipped, those targets are blocked anyway.
+    boxes = np.clip(targets[:, :, None, :] + ACTION_TO_DIRECTION, 0, size - 1)
+    safe &= ~occupied[arena[:, :, None], boxes[..., 0], boxes[..., 1]].any(axis=2)
+    return safe.astype(np.int8)
+
+
+def batch_project(
+    agents: np.ndarray,
+    robots: np.ndarray,
+    alive: np.ndarray,
+    zappers: np.ndarray,
+    size: int,
+):
+    """Projects all nine actions from each of a batch of states.
+
+    The inputs are not changed. Entry ``[m, a]`` of each result is the
+    outcome of taking action ``a`` from state ``m``.
+
+    Args:
+        agents: (M, 2) agent positions.
+        robots: (M, R, 2) robot positions.
+        alive: (M, R) bool robot alive flags.
+        zappers: (M, Z, 2) zapper positions.
+        size: width and height of the arenas.
+
+    Returns:
+        A tuple of (agents, robots, alive, rewards, terminated) arrays of shape
+        (M, 9, 2), (M, 9, R, 2), (M, 9, R), (M, 9) and (M, 9).
+    """
+    m = len(agents)
+    actions = len(ACTION_TO_DIRECTION)
+    blocked, occupied = batch_grids(robots, alive, zappers, size)
+    next_agents = np.repeat(agents, actions, axis=0)
+    next_robots = np.repeat(robots, actions, axis=0)
+    next_alive = np.repeat(alive, actions, axis=0)
+    rewards, terminated = batch_step(
+        next_agents,
+        next_robots,
+        next_alive,
+        np.repeat(blocked, actions, axis=0),
+        np.repeat(occupied, actions, axis=0),
+        np.tile(np.arange(actions), m),
+    )
+    return (
+        next_agents.reshape(m, actions, 2),
+        next_robots.reshape(m, actions, -1, 2),
+        next_alive.reshape(m, actions, -1),
+        rewards.reshape(m, actions),
+        terminated.reshape(m, actions),
+    )
+
+
+class ChaseState:
+    """Compact game state held as fixed shape arrays.
+
+    A real step updates the arrays in place. ``copy`` gives a cheap struct
+    copy for projections: the zappers never move so they are shared, read
+    only, between copies.
+
+    Collision tests are a lookup in one of two structures:
+        - ``walls``: a read only (size, size) grid of BOUNDARY, ZAPPER or EMPTY.
+          It never changes during an episode so copies share it; and
+        - ``occupied``: a Dict from the flat square ``x * size + y`` of each live
+          robot to its index.
+
+    ``active`` lists the live robots in index order. Steps keep ``occupied``
+    and ``active`` in line with ``robots`` and ``alive``, so a copy and a step
+    cost time in the number of live robots rather than the arena area.
+    """
+
+    __slots__ = ("agent", "robots", "alive", "zappers", "walls", "occupied", "active")
+
+    def __init__(
+        self,
+        agent: np.ndarray,
+        robots: np.ndarray,
+        alive: np.ndarray,
+        zappers: np.ndarray,
+        walls: np.ndarray,
+        occupied: dict,
+        active: list,
+    ) -> None:
+        """Wrap (2,) agent, (R, 2) robot, (R,) alive, (Z, 2) zapper and walls arrays.
+
+        Use ``from_arrays`` to build ``walls``, ``occupied`` and ``active``.
+        """
+        self.agent = agent
+        self.robots = robots
+        self.alive = alive
+        self.zappers = zappers
+        self.walls = walls
+        self.occupied = occupied
+        self.active = active
+
+    def copy(self) -> "ChaseState":
+        """Returns a copy that can be stepped without touching this state."""
+        return ChaseState(
+            self.agent.copy(),
+            self.robots.copy(),
+            self.alive.copy(),
+            self.zappers,
+            self.walls,
+            self.occupied.copy(),
+            self.active.copy(),
+        )
+
+    @property
+    def size(self) -> int:
+        """Width and height of the arena."""
+        return self.walls.shape[0]
+
+    @staticmethod
+    def build_walls(zappers: np.ndarray, size: int) -> np.ndarray:
+        """Returns the read only grid of the boundary and zappers."""
+        walls = _boundary(size).copy()
+        walls[zappers[:, 0], zappers[:, 1]] = ZAPPER
+        walls.flags.writeable = False
+        return walls
+
+    @classmethod
+    def from_arrays(
+        cls,
+        agent: np.ndarray,
+        robots: np.ndarray,
+        alive: np.ndarray,
+        zappers: np.ndarray,
+        size: int,
+    ) -> "ChaseState":
+        """Builds a state and its lookups from agent, robot, alive and zapper arrays.
+
+        The state keeps a read only copy of zappers, which copies of it share.
+        """
+        zappers = zappers.copy()
+        zappers.flags.writeable = False
+        active = np.flatnonzero(alive).tolist()
+        squares = (robots[active, 0] * size + robots[active, 1]).tolist()
+        return cls(
+            agent,
+            robots,
+            alive,
+            zappers,
+            cls.build_walls(zappers, size),
+            dict(zip(squares, active)),
+            active,
+        )
+
+    @classmethod
+    def from_arena(
+        cls, agent: np.ndarray, robots: np.ndarray, zappers: np.ndarray, size: int
+    ) -> "ChaseState":
+        """Builds the starting state, all robots alive, for a generated arena."""
+        alive = np.ones(len(robots), dtype=np.int8)
+        return cls.from_arrays(agent, robots, alive, zappers, size)
+
+    @classmethod
+    def from_observation(cls, observation: dict, size: int = 20) -> "ChaseState":
+        """Builds a state from the nested Dict observation used by ChaseEnv."""
+        robots = observation["robots"]
+        zappers = np.array(
+            [observation["zappers"][z] for z in sorted(observation["zappers"])],
+            dtype=np.int32,
+        ).reshape(-1, 2)
+        locations = np.array(
+            [robots[r]["location"] for r in sorted(robots)], dtype=np.int32
+        ).reshape(-1, 2)
+        alive = np.array([robots[r]["alive"] for r in sorted(robots)], dtype=np.int8)
+        return cls.from_arrays(
+            np.array(observation["agent"], dtype=np.int32),
+            locations,
+            alive,
+            zappers,
+            size,
+        )
+
+    def to_observation(self) -> dict:
+        """Returns the nested Dict observation for this state.
+
+        The arrays are writable copies so neither later steps nor changes to
+        the observation affect each other.
+        """
+        robots = self.robots.copy()
+        zappers = self.zappers.copy()
+        alive = self.alive.tolist()
+        return {
+            "agent": self.agent.copy(),
+            "robots": {
+                r: {"alive": alive[r], "location": robots[r]} for r in range(len(alive))
+            },
+            "zappers": dict(enumerate(zappers)),
+        }
+
+
+def advance(state: ChaseState, action: int) -> Tuple[int, bool]:
+    """Applies action to state in place and returns the reward and terminated flag.
+
+    This is the scalar form of the game rules used by ChaseEnv.step. Use
+    chase_transition to step without changing state.
+    """
+    r = 0
+    terminated = False
+
+    walls = state.walls
+    occupied = state.occupied
+    active = state.active
+    size = walls.shape[0]
+    robots = state.robots.tolist()
+
+    # All robots eliminated is judged on the state before the step.
+    robots_left = bool(active)
+
+    # Move agent.
+    move_x, move_y = _DIRECTIONS[action]
+    a_x, a_y = state.agent.tolist()
+    a_x += move_x
+    a_y += move_y
+    state.agent[:] = a_x, a_y
+
+    # Assess agent move - did it run into a boundary, zapper or robot?
+    if not (0 <= a_x < size and 0 <= a_y < size):
+        # Left the arena, only possible after the episode has terminated.
+        terminated = True
+    elif walls.item(a_x, a_y) != EMPTY or a_x * size + a_y in occupied:
+        # Ran into boundary, zapper or robot.
+        terminated = True
+
+    # Even if Agent dies, complete step for possible pyrrhic reward.
+
+    # # Iterate through the live robots in index order, moving and assessing.
+    zapped = []
+    for i in active:
+        r_x, r_y = robots[i]
+
+        # Which way to the agent?
+        tar_x = a_x - r_x
+        tar_y = a_y - r_y
+        abs_x = abs(tar_x)
+        abs_y = abs(tar_y)
+        move_x = (tar_x > 0) - (tar_x < 0) if abs_x >= abs_y else 0
+        move_y = (tar_y > 0) - (tar_y < 0) if abs_y >= abs_x else 0
+
+        # Commit move if not moving onto another robot. A robot staying put
+        # finds itself, so only a robot that moved can reach a zapper.
+        target = (r_x + move_x) * size + r_y + move_y
+        if target not in occupied:
+            del occupied[r_x * size + r_y]
+            r_x += move_x
+            r_y += move_y
+            robots[i] = [r_x, r_y]
+
+            # Check if robot has done something stupid.
+            if walls.item(target) != EMPTY:
+                # ZZZAAAAPPPPP!!!! - Fried robot.
+                zapped.append(i)
+                r += 1
+            else:
+                occupied[target] = i
+
+        # Has robot caught the player?
+        if r_x == a_x and r_y == a_y:
+            # ZZZAAAAPPPPP!!!! - Agent caught by Robot.
+            terminated = True
+
+    if robots:
+        state.robots[:] = robots
+
+    # Zapped robots leave the active list for good.
+    if zapped:
+        state.alive[zapped] = 0
+        state.active = [i for i in active if state.alive[i]]
+
+    # If the episode has been terminated then we know if the agent has
+    # been eliminated by moving into a zapper or robot, or the agent
+    # been caught by a robot.
+    if terminated:
+        r -= 1
+
+    # All robots eliminated? Game over!
+    if not robots_left:
+        terminated = True
+
+    return r, terminated
+
+
+def chase_transition(state: ChaseState, action: int) -> Tuple[ChaseState, int, bool]:
+    """Pure transition function of the game.
+
+    Args:
+        state: state to step from. It is not changed.
+        action: action taken by the agent.
+
+    Returns:
+        A tuple of (next_state, reward, terminated) matching ChaseEnv.step.
+    """
+    next_state = state.copy()
+    reward, terminated = advance(next_state, action)
+    return next_state, reward, terminated
+
+
+def encode_state(state: ChaseState) -> bytes:
+    """Packs a state into a compact bytes string.
+
+    The encoding holds the arena size, robot and zapper counts, agent, robot
+    locations, alive flags and zappers as int16 values. It is hashable and
+    cheap to pickle, so it can be used as a cache key or sent to worker
+    processes, and decode_state restores the state.
+    """
+    header = (state.size, len(state.robots), len(state.zappers))
+    values = np.concatenate(
+        [header, state.agent, state.robots.ravel(), state.alive, state.zappers.ravel()]
+    )
+    return values.astype(np.int16).tobytes()
+
+
+def decode_state(data: bytes) -> ChaseState:
+    """Restores a state packed by encode_state."""
+    values = np.frombuffer(data, dtype=np.int16).astype(np.int32)
+    size, robots, zappers = values[:3].tolist()
+    agent = values[3:5].copy()
+    end = 5 + 2 * robots
+    locations = values[5:end].reshape(robots, 2).copy()
+    alive = values[end : end + robots].astype(np.int8)
+    zapper_locations = values[end + robots :].reshape(zappers, 2).copy()
+    return ChaseState.from_arrays(agent, locations, alive, zapper_locations, size)
+
+
+def state_key(state: ChaseState) -> bytes:
+    """Returns a hashable key identifying a state of a given arena size.
+
+    Cheaper than encode_state as the arrays are joined as they are, but it can
+    not be decoded.
+    """
+    return b"".join(
+        (
+            state.agent.tobytes(),
+            state.robots.tobytes(),
+            state.alive.tobytes(),
+            state.zappers.tobytes(),
+        )
+    )
+
+
+class TransitionCache:
+    """Least recently used cache of transitions.
+
+    Entries are evicted least recently used first once ``capacity`` is
+    reached. ``hits``, ``misses`` and ``evictions`` count cache activity.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """Create an empty cache holding at most capacity transitions."""
+        if capacity < 1:
+            raise ValueError(f"Cache capacity must be at least 1, got {capacity}.")
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        """Number of cached transitions."""
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[tuple]:
+        """Returns the transition stored under key, or None if it is not cached."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: Hashable, transition: tuple) -> None:
+        """Stores a transition, evicting the least recently used one if full."""
+        self._entries[key] = transition
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drops all cached transitions and resets the counters."""
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        """Returns the capacity, size and hit, miss and eviction counts."""
+        return {
+            "capacity": self.capacity,
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class PhaseTimer:
+    """Cumulative time and call counts of named phases.
+
+    ``add(phase, start)`` charges the time since ``start`` to phase and
+    returns the current time, so consecutive phases chain:
+    ```
+    start = time.perf_counter()
+    ...
+    start = timer.add("rules", start)
+    ```
+    """
+
+    def __init__(self) -> None:
+        """Create a timer with no phases recorded."""
+        self.seconds = {}
+        self.calls = {}
+
+    def add(self, phase: str, start: float) -> float:
+        """Charges the time since start to phase and returns the current time."""
+        now = perf_counter()
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + now - start
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+        return now
+
+    def clear(self) -> None:
+        """Drops all recorded times and counts."""
+        self.seconds.clear()
+        self.calls.clear()
+
+    def stats(self) -> dict:
+        """Returns the calls, total seconds and mean microseconds of each phase."""
+        return {
+            phase: {
+                "calls": self.calls[phase],
+                "total_s": seconds,
+                "mean_us": seconds / self.calls[phase] * 1e6,
+            }
+            for phase, seconds in self.seconds.items()
+        }
+
+
+@lru_cache(maxsize=None)
+def _counters(count: int) -> np.ndarray:
+    """Returns the offsets from a stream key of its first count counters."""
+    counters = np.arange(1, count + 1, dtype=np.uint64) * _STEPS[1]
+    counters.flags.writeable = False
+    return counters
+
+
+@lru_cache(maxsize=None)
+def _draw_numbers(count: int) -> np.ndarray:
+    """Returns the uint64 numbers 0 to count - 1 of the draws of a stream."""
+    numbers = np.arange(count, dtype=np.uint64)
+    numbers.flags.writeable = False
+    return numbers
+
+
+@lru_cache(maxsize=None)
+def _interior(size: int) -> np.ndarray:
+    """Returns the read only (x, y) int32 coordinates of each interior square."""
+    inner = size - 2
+    squares = np.stack(np.divmod(np.arange(inner * inner), inner), axis=1) + 1
+    squares = squares.astype(np.int32)
+    squares.flags.writeable = False
+    return squares
+
+
+@lru_cache(maxsize=None)
+def _boundary(size: int) -> np.ndarray:
+    """Returns a read only walls grid of the boundary alone for an arena size."""
+    walls = np.full((size, size), EMPTY, dtype=np.int8)
+    walls[[0, -1], :] = BOUNDARY
+    walls[:, [0, -1]] = BOUNDARY
+    walls.flags.writeable = False
+    return walls
@@ -1,12 +1,30 @@
 """Gymnasium gym-chase toy_text environment."""
-import copy
-import random
 import sys
-from typing import Optional, Tuple
+from time import perf_counter
+from typing import Optional, Sequence, Tuple
 
 import gymnasium as gym
 import numpy as np
 from gymnasium.spaces import Box, Dict, Discrete
+from gymnasium.utils import seeding
+
+from gym_chase.arena_bank import check_bank, load_bank
+from gym_chase.envs.chase_core import (
+    EMPTY,
+    ZAPPER,
+    ChaseState,
+    PhaseTimer,
+    TransitionCache,
+    advance,
+    arena_keys,
+    batch_project,
+    check_arena_size,
+    generate_arenas,
+    robot_threats,
+    safe_actions,
+    state_key,
+    stream_key,
+)
 
 
 class ChaseEnv(gym.Env):
@@ -75,16 +93,114 @@ class ChaseEnv(gym.Env):
     The agent receives a reward of 1 for each robot eliminated, -1 if the agent
     is eliminated and zero otherwise.
 
+    The arena size, number of robots and number of zappers can be changed with
+    the ``size``, ``robots`` and ``zappers`` arguments, e.g.
+    ``gym.make("gym_chase:Chase-v1", size=64, robots=40, zappers=160)``.
+
+    ``obs_mode`` selects the observation format:
+        - "dict": the nested Dict described above (default);
+        - "flat": an int32 vector of the agent x, y, each robot's x, y and
+          alive flag, then each zapper's x, y;
+        - "array": a Dict of an (2,) agent, (robots, 3) robot and (zappers, 2)
+          zapper arrays, the per arena layout of ChaseVectorEnv; or
+        - "grid": a (3, size, size) uint8 tensor with channels for the
+          boundary and zappers, live robots and the agent.
+
+    The "flat", "array" and "grid" observations are written into buffers
+    allocated once, so each call to ``step`` or ``reset`` overwrites the
+    previous observation. Copy it if it needs to be kept.
+
+    ``transition_cache`` sets the capacity of a least recently used cache of
+    projected transitions keyed on the packed state and action, so repeated
+    ``step(action, project=True)`` calls skip the game logic. It is off by
+    default. Hit and miss counts are available from
+    ``env.transition_cache.stats()``.
+
+    ``arena_bank`` is a ``.npy`` file written by ``gym_chase.arena_bank``. It
+    is memory mapped and ``reset(seed=i)`` takes arena ``i`` from it instead of
+    generating it, giving the same arena. Unseeded resets take an arena at
+    random from the bank and seeds past the end of the bank are generated. A
+    bank of a different arena size, robot or zapper count raises ValueError.
+
+    Arenas come from counter based random streams rather than a generator.
+    ``reset(seed=s)`` starts episode 0 of stream ``s`` and each unseeded reset
+    moves on to the next episode of the stream, so a run of resets is
+    reproducible from its first seed and envs never share random state. An
+    env that was never seeded picks its stream from ``self.np_random``. Arenas
+    never draw from ``np_random``, so ``reset(seed=s)`` only records ``s`` and
+    the generator is rebuilt from it the first time it is used.
+    ``reset_many(seeds)`` generates the arenas of many seeds in one call.
+
+    ``profile=True`` records the cumulative time and call count of each phase
+    of ``step``, ``reset`` and ``render``, e.g. "project.copy", "step.rules"
+    or "reset.generate", returned by ``env.stats()``. When it is off each
+    phase costs one check of ``env.profiler``.
+
+    ``action_mask=True`` adds ``info["action_mask"]`` to ``step`` and ``reset``,
+    a (9,) int8 mask of the actions the agent survives: those that do not lead
+    into the boundary, a zapper or a robot, or next to a live robot, which would
+    catch it. It can be passed to ``action_space.sample(mask)``.
+    ``threat_map=True`` adds ``info["threat_map"]``, a (size, size) bool map of
+    the squares within one move of a live robot. The map is a buffer reused by
+    every call, so copy it if it needs to be kept.
+
     """
 
-    metadata = {"render_modes": ["human"], "render_fps": 1}
+    metadata = {"render_modes": ["human", "ansi", "rgb_array"], "render_fps": 1}
+
+    def __init__(
+        self,
+        render_mode: Optional[str] = None,
+        size: int = 20,
+        robots: int = 5,
+        zappers: int = 10,
+        obs_mode: str = "dict",
+        transition_cache: int = 0,
+        arena_bank: Optional[str] = None,
+        profile: bool = False,
+        action_mask: bool = False,
+        threat_map: bool = False,
+    ) -> None:
+        """Setup action and observation spaces, default keymap and arena size.
 
-    def __init__(self, render_mode: Optional[str] = None) -> None:
-        """Setup action and observation spaces, default keymap and arena size."""
+        Args:
+            render_mode: "human", "ansi" or "rgb_array".
+            size: width and height of the arena including the boundary.
+            robots: number of robots chasing the agent.
+            zappers: number of free standing zappers.
+            obs_mode: one of "dict", "flat", "array" or "grid".
+            transition_cache: capacity of the projection cache, 0 disables it.
+            arena_bank: path of an arena bank to reset from.
+            profile: record the time spent in each phase, see ``stats``.
+            action_mask: add the mask of safe actions to info.
+            threat_map: add the map of squares threatened by robots to info.
+        """
+        check_arena_size(size, robots, zappers)
+        if obs_mode not in OBS_MODES:
+            raise ValueError(f"obs_mode must be one of {OBS_MODES}, got {obs_mode!r}.")
+        self.obs_mode = obs_mode
+        self.transition_cache = (
+            TransitionCache(transition_cache) if transition_cache else None
+        )
+        self.profiler = PhaseTimer() if profile else None
+        self.action_mask = action_mask
+        self.threat_map = threat_map
         self.render_mode = render_mode
-        self.size = 20
-        self.robots = 5
-        self.zappers = 10
+        self.size = size
+        self.robots = robots
+        self.zappers = zappers
+
+        # Random stream of the episodes and the seed np_random is yet to be
+        # reseeded from, see reset.
+        self._stream_seed = None
+        self._episode = 0
+        self._generator = None
+        self._np_random_seed = None
+
+        self.arena_bank = None
+        if arena_bank is not None:
+            self.arena_bank = load_bank(arena_bank)
+            check_bank(self.arena_bank, size, robots, zappers)
 
         robot_space = Dict()
         for r in range(self.robots):
@@ -99,13 +215,50 @@ class ChaseEnv(gym.Env):
         for z in range(self.zappers):
             zapper_space[z] = Box(0, self.size - 1, shape=(2,), dtype=np.int32)
 
-        self.observation_space = Dict(
-            {
-                "agent": Box(0, self.size - 1, shape=(2,), dtype=np.int32),
-                "robots": robot_space,
-                "zappers": zapper_space,
-            }
-        )
+        if obs_mode == "dict":
+            self.observation_space = Dict(
+                {
+                    "agent": Box(0, self.size - 1, shape=(2,), dtype=np.int32),
+                    "robots": robot_space,
+                    "zappers": zapper_space,
+                }
+            )
+        elif obs_mode == "flat":
+            self.observation_space = Box(
+                0, self.size - 1, shape=(self._flat_length,), dtype=np.int32
+            )
+        elif obs_mode == "array":
+            self.observation_space = Dict(
+                {
+                    "agent": Box(0, self.size - 1, shape=(2,), dtype=np.int32),
+                    "robots": Box(
+                        0, self.size - 1, shape=(self.robots, 3), dtype=np.int32
+                    ),
+                    "zappers": Box(
+                        0, self.size - 1, shape=(self.zappers, 2), dtype=np.int32
+                    ),
+                }
+            )
+        else:
+            self.observation_space = Box(
+                0, 1, shape=(3, self.size, self.size), dtype=np.uint8
+            )
+
+        # Buffers the array observations are written into. The "array" mode
+        # arrays are views of the "flat" vector.
+        self._flat_obs = np.zeros(self._flat_length, dtype=np.int32)
+        self._array_obs = {
+            "agent": self._flat_obs[:2],
+            "robots": self._flat_obs[2 : 2 + 3 * self.robots].reshape(self.robots, 3),
+            "zappers": self._flat_obs[2 + 3 * self.robots :].reshape(self.zappers, 2),
+        }
+        self._grid_obs = np.zeros((3, self.size, self.size), dtype=np.uint8)
+        self._threats = np.zeros((self.size, self.size), dtype=bool)
+        self._grid_zappers = None
+
+        # Render backgrounds, rebuilt when the zappers change with a new arena.
+        self._text_zappers = None
+        self._rgb_zappers = None
 
         self.action_space = Discrete(9)
 
@@ -121,198 +274,418 @@ class ChaseEnv(gym.Env):
             8: np.array([-1, 1]),
         }
 
+    @property
+    def _flat_length(self) -> int:
+        """Length of the "flat" observation vector."""
+        return 2 + 3 * self.robots + 2 * self.zappers
+
+    def _get_obs(self, state: ChaseState):
+        """Returns the observation of state in the format set by obs_mode."""
+        if self.obs_mode == "dict":
+            return state.to_observation()
+
+        if self.obs_mode == "grid":
+            grid_obs = self._grid_obs
+            if state.zappers is not self._grid_zappers:
+                # Zappers only change with a new arena.
+                grid_obs[0] = 0
+                grid_obs[0, [0, -1], :] = 1
+                grid_obs[0, :, [0, -1]] = 1
+                grid_obs[0, state.zappers[:, 0], state.zappers[:, 1]] = 1
+                self._grid_zappers = state.zappers
+            grid_obs[1] = 0
+            live = state.robots[state.active]
+            grid_obs[1, live[:, 0], live[:, 1]] = 1
+            grid_obs[2] = 0
+            a_x, a_y = state.agent.tolist()
+            if 0 <= a_x < self.size and 0 <= a_y < self.size:
+                grid_obs[2, a_x, a_y] = 1
+            return grid_obs
+
+        array_obs = self._array_obs
+        array_obs["agent"][:] = state.agent
+        array_obs["robots"][:, :2] = state.robots
+        array_obs["robots"][:, 2] = state.alive
+        array_obs["zappers"][:] = state.zappers
+        return self._flat_obs if self.obs_mode == "flat" else array_obs
+
     def get_keys_to_action(self) -> Dict:
         """Return default keymap for chase."""
         return {key + 1: value for key, value in self.action_to_direction.items()}
 
-    def _generate_arena(self, random_seed: Optional[int] = 0) -> np.ndarray:
-        """Generates a random valid map.
+    def _generate_arena(self) -> ChaseState:
+        """Generates the arena of the current episode's random stream.
+
+        Returns:
+            A random valid map
+        """
+        keys = np.array([stream_key(self._stream_seed, self._episode)], np.uint64)
+        agents, robots, zappers = generate_arenas(
+            keys, self.size, self.robots, self.zappers
+        )
+        return ChaseState.from_arena(agents[0], robots[0], zappers[0], self.size)
+
+    def _bank_arena(self, seed: Optional[int]) -> ChaseState:
+        """Returns the arena for seed from the arena bank.
+
+        Unseeded resets take a random arena from the bank and seeds past the
+        end of it are generated.
+        """
+        if seed is None:
+            key = stream_key(self._stream_seed, self._episode)
+            seed = key % len(self.arena_bank)
+        elif seed >= len(self.arena_bank):
+            return self._generate_arena()
+        entry = self.arena_bank[seed]
+        return ChaseState.from_arena(
+            entry["agent"].astype(np.int32),
+            entry["robots"].astype(np.int32),
+            entry["zappers"].astype(np.int32),
+            self.size,
+        )
+
+    def reset_many(self, seeds: Sequence[int]) -> Dict:
+        """Returns the starting states ``reset(seed=s)`` gives for many seeds.
+
+        The arenas are generated together in one vectorized call, or read from
+        the arena bank. The env itself is not reset.
 
         Args:
-            random_seed: seed used to generate arena. Allows consistent sequence generation.
+            seeds: (M,) seeds.
 
         Returns:
-            A random valid map
+            A Dict of "agent" (M, 2), "robots" (M, robots, 3) and "zappers"
+            (M, zappers, 2) int32 arrays, the layout of ChaseVectorEnv
+            observations, which project_all_batch accepts.
         """
-        random.seed(random_seed)
-
-        # Place 10 zappers.
-        zapper_list = np.empty((0, 2), int)
-        while len(zapper_list) < 10:
-            loc = np.array([[random.randint(1, 18), random.randint(1, 18)]])
-            if loc not in zapper_list:
-                zapper_list = np.append(zapper_list, loc, axis=0)
-
-        # Place robots.
-        robot_list = np.empty((0, 2), int)
-        while len(robot_list) < self.robots:
-            loc = np.array([[random.randint(1, 18), random.randint(1, 18)]])
-            if (loc not in zapper_list) and (loc not in robot_list):
-                robot_list = np.append(robot_list, loc, axis=0)
-
-        # Place agent.
-        agent_pos = None
-        while agent_pos is None:
-            location = np.array([random.randint(1, 18), random.randint(1, 18)])
-            if (location not in zapper_list) and (location not in robot_list):
-                agent_pos = location
-
-        # Convert lists to expected observation space.
-        robot_list = dict(enumerate([{"alive": 1, "location": r} for r in robot_list]))
-        zapper_list = dict(enumerate(zapper_list))
-
-        return {"agent": agent_pos, "robots": robot_list, "zappers": zapper_list}
+        seeds = np.asarray(seeds, dtype=np.int64)
+        agents = np.empty((len(seeds), 2), dtype=np.int32)
+        robots = np.empty((len(seeds), self.robots, 2), dtype=np.int32)
+        zappers = np.empty((len(seeds), self.zappers, 2), dtype=np.int32)
+        generated = np.ones(len(seeds), dtype=bool)
+        if self.arena_bank is not None:
+            generated = seeds >= len(self.arena_bank)
+            entries = self.arena_bank[seeds[~generated]]
+            agents[~generated] = entries["agent"]
+            robots[~generated] = entries["robots"]
+            zappers[~generated] = entries["zappers"]
+        (
+            agents[generated],
+            robots[generated],
+            zappers[generated],
+        ) = generate_arenas(
+            arena_keys(seeds[generated]), self.size, self.robots, self.zappers
+        )
+        alive = np.ones(robots.shape[:2] + (1,), dtype=np.int32)
+        return {
+            "agent": agents,
+            "robots": np.concatenate([robots, alive], axis=2),
+            "zappers": zappers,
+        }
+
+    def _add_safety_info(self, state: ChaseState, info: Dict) -> None:
+        """Adds the action mask and threat map of state to info as turned on."""
+        threats = robot_threats(state.robots, state.active, self.size, self._threats)
+        if self.action_mask:
+            info["action_mask"] = safe_actions(state.agent, state.walls, threats)
+        if self.threat_map:
+            info["threat_map"] = threats
 
     def step(
         self, action: int, project: Optional[bool] = False
     ) -> Tuple[Dict, int, bool, bool, Dict]:
-        """Move agent based on action, move robots in response and assess outcomes."""
-        projected_state = copy.deepcopy(self.game_state)
-        r = 0
-        terminated = False
+        """Move agent based on action, move robots in response and assess outcomes.
+
+        Raises:
+            ValueError: if action is not between 0 and 8.
+        """
+        if not 0 <= action <= 8:
+            raise ValueError(f"Action must be between 0 and 8, got {action}.")
+        timer = self.profiler
+        if timer is not None:
+            start = perf_counter()
+
+        # Real steps update the state in place, projections step a struct copy.
+        if project:
+            transition = None
+            if self.transition_cache is not None:
+                key = (state_key(self._state), int(action))
+                transition = self.transition_cache.get(key)
+                if timer is not None:
+                    start = timer.add("project.cache", start)
+            if transition is None:
+                state = self._state.copy()
+                if timer is not None:
+                    start = timer.add("project.copy", start)
+                r, terminated = advance(state, action)
+                if timer is not None:
+                    start = timer.add("project.rules", start)
+                if self.transition_cache is not None:
+                    self.transition_cache.put(key, (state, r, terminated))
+            else:
+                state, r, terminated = transition
+        else:
+            state = self._state
+            r, terminated = advance(state, action)
+            if timer is not None:
+                start = timer.add("step.rules", start)
         # Episodes are never truncated. Unless there is a wrapper with a move timer.
         truncated = False
 
-        # Move agent.
-        projected_state["agent"] += self.action_to_direction[action]
-        a_pos = projected_state["agent"]
-
-        # Assess agent move - did it run into a boundary, zapper or robot?
-        if a_pos[0] in [0, 19]:
-            # Ran into boundary.
-            terminated = True
-        elif a_pos[1] in [0, 19]:
-            # Ran into boundary.
-            terminated = True
-        elif any([(a_pos == z).all() for z in self.game_state["zappers"].values()]):
-            # Ran into zapper.
-            terminated = True
-        elif any(
-            [(a_pos == r["location"]).all() for r in self.game_state["robots"].values()]
-        ):  # Ran into robot.
-            terminated = True
-
-        # Even if Agent dies, complete step for possible pyrrhic reward.
-
-        # # Iterate through robots moving and assessing.
-        for robot in projected_state["robots"].values():
-            if robot["alive"]:
-                r_pos = robot["location"]
-
-                # Which way to the agent?
-                tar_x = a_pos[0] - r_pos[0]
-                tar_y = a_pos[1] - r_pos[1]
-
-                if abs(tar_x) == abs(tar_y):
-                    r_move = np.array([np.sign(tar_x), np.sign(tar_y)])
-                elif abs(tar_x) > abs(tar_y):
-                    r_move = np.array([np.sign(tar_x), 0])
-                else:
-                    r_move = np.array([0, np.sign(tar_y)])
-
-                # Commit move if not moving onto another robot.
-                r_clash = r_pos + r_move
-
-                if not any(
-                    [
-                        (r_clash == r["location"]).all() and r["alive"]
-                        for r in projected_state["robots"].values()
-                    ]
-                ):
-                    r_pos += r_move
-                    robot["location"] = r_pos
-
-                # Has robot caught the player?
-                if np.array_equal(r_pos, a_pos):
-                    # ZZZAAAAPPPPP!!!! - Agent caught by Robot.
-                    terminated = True
-
-                # Check if robot has done something stupid.
-                r_zapped = False
-                if r_pos[0] in [0, 19]:
-                    r_zapped = True
-                elif r_pos[1] in [0, 19]:
-                    r_zapped = True
-                elif any(
-                    [(r_pos == z).all() for z in projected_state["zappers"].values()]
-                ):
-                    r_zapped = True
-
-                if r_zapped:
-                    # ZZZAAAAPPPPP!!!! - Fried robot.
-                    robot["alive"] = 0
-                    r += 1
-
-        # If the episode has been terminated then we know if the agent has
-        # been eliminated by moving into a zapper or robot, or the agent
-        # been caught by a robot.
-        if terminated:
-            r -= 1
-
-        # All robots eliminated? Game over!
-        if sum(r["alive"] for r in self.game_state["robots"].values()) == 0:
-            terminated = True
-
-        if not project:
-            # If the step is not a projection then update the game state.
-            # print("Updating real state.")
-            self.game_state = projected_state
-            observation = self.game_state
-        else:
-            # If the step is a projection then return the projected state.
-            # print("Projecting state.")
-            observation = projected_state
+        # A projection returns the projected state, a real step the updated one.
+        observation = self._get_obs(state)
+        if timer is not None:
+            timer.add("project.observation" if project else "step.observation", start)
 
-        # print("Observation: ", observation["agent"], r)
         # Indicate if the result is a projective state. i.e. it wasn't stepped forward.
         info = {"project": project}
+        if self.action_mask or self.threat_map:
+            self._add_safety_info(state, info)
 
         return observation, r, terminated, truncated, info
 
+    def project_all(self, state=None) -> Tuple[Dict, np.ndarray, np.ndarray]:
+        """Projects all nine actions from a state in one call.
+
+        Row ``a`` of each result matches ``step(a, project=True)`` taken from
+        the same state. The env is not changed. To expand many states at once
+        use ``project_all_batch``, which is vectorized across states.
+
+        Args:
+            state: a ChaseState or "dict" observation to project from. Defaults
+                to the current state.
+
+        Returns:
+            A tuple of (successors, rewards, terminated). successors is a Dict of
+            "agent" (9, 2), "robots" (9, robots, 3) and "zappers" (9, zappers, 2)
+            arrays in the "array" observation layout.
+        """
+        if state is None:
+            state = self._state
+        elif not isinstance(state, ChaseState):
+            state = ChaseState.from_observation(state, self.size)
+
+        projected = [state.copy() for _ in self.action_to_direction]
+        outcomes = [advance(p, action) for action, p in enumerate(projected)]
+        rewards, terminated = zip(*outcomes)
+
+        robots = np.empty((len(projected), self.robots, 3), dtype=np.int32)
+        robots[:, :, :2] = [p.robots for p in projected]
+        robots[:, :, 2] = [p.alive for p in projected]
+        successors = {
+            "agent": np.array([p.agent for p in projected]),
+            "robots": robots,
+            "zappers": np.broadcast_to(
+                state.zappers, (len(projected),) + state.zappers.shape
+            ),
+        }
+        return successors, np.array(rewards), np.array(terminated)
+
+    def project_all_batch(self, states: Dict) -> Tuple[Dict, np.ndarray, np.ndarray]:
+        """Projects all nine actions from each of a batch of states.
+
+        Args:
+            states: a Dict of "agent" (M, 2), "robots" (M, robots, 3) and
+                "zappers" (M, zappers, 2) arrays, the layout of ChaseVectorEnv
+                observations.
+
+        Returns:
+            A tuple of (successors, rewards, terminated) with shapes (M, 9, ...),
+            (M, 9) and (M, 9). Reshaping successors to (M * 9, ...) gives a batch
+            that can be projected again.
+        """
+        robots = np.asarray(states["robots"], dtype=np.int32)
+        zappers = np.asarray(states["zappers"], dtype=np.int32)
+        agents, locations, alive, rewards, terminated = batch_project(
+            np.asarray(states["agent"], dtype=np.int32),
+            robots[:, :, :2],
+            robots[:, :, 2].astype(bool),
+            zappers,
+            self.size,
+        )
+        m, actions = rewards.shape
+        successors = {
+            "agent": agents,
+            "robots": np.concatenate(
+                [locations, alive[..., None].astype(np.int32)], axis=-1
+            ),
+            "zappers": np.broadcast_to(
+                zappers[:, None], (m, actions) + zappers.shape[1:]
+            ),
+        }
+        return successors, rewards, terminated
+
+    @property
+    def _np_random(self) -> Optional[np.random.Generator]:
+        """The generator behind ``np_random``, seeded from the last reset seed."""
+        if self._np_random_seed is not None:
+            self._generator, _ = seeding.np_random(self._np_random_seed)
+            self._np_random_seed = None
+        return self._generator
+
+    @_np_random.setter
+    def _np_random(self, value: Optional[np.random.Generator]) -> None:
+        """Sets the generator, dropping any reseed still to be done."""
+        self._generator = value
+        self._np_random_seed = None
+
     def reset(
         self,
         seed: Optional[int] = None,
         options: Optional[dict] = None,
     ) -> Tuple[Dict, Dict]:
-        """Returns a new arena based on random_seed."""
-        self.game_state = self._generate_arena(random_seed=seed)
+        """Returns a new arena based on seed."""
+        timer = self.profiler
+        if timer is not None:
+            start = perf_counter()
+
+        if seed is not None:
+            if not (isinstance(seed, int) and seed >= 0):
+                seeding.np_random(seed)  # Raises gymnasium's seed error.
+            # np_random is reseeded on its first use, see _np_random.
+            self._np_random_seed = seed
+            self._stream_seed, self._episode = seed, 0
+        elif self._stream_seed is None:
+            self._stream_seed = int(self.np_random.integers(2**63))
+        else:
+            self._episode += 1
+        if timer is not None:
+            start = timer.add("reset.seed", start)
+        if self.arena_bank is None:
+            self._state = self._generate_arena()
+        else:
+            self._state = self._bank_arena(seed)
+        if timer is not None:
+            start = timer.add("reset.generate", start)
 
-        observation = self.game_state
-        # TODO: Add info. For now return an empty dict.
+        observation = self._get_obs(self._state)
+        if timer is not None:
+            timer.add("reset.observation", start)
         info = {}
+        if self.action_mask or self.threat_map:
+            self._add_safety_info(self._state, info)
 
         return observation, info
 
-    def render(self, render_state: Optional[Dict] = None) -> None:
-        """Outputs a text representation of the observation space."""
+    def render(self, render_state: Optional[Dict] = None):
+        """Renders the arena in the env's render mode.
+
+        "human", and no render mode as before, write the text map to stdout,
+        "ansi" returns it as a string and "rgb_array" returns an image. The
+        frame is drawn over a cached background of the boundary and zappers.
+        The rgb_array image is a buffer reused by every call, so copy it if it
+        needs to be kept.
+
+        Args:
+            render_state: a "dict" observation to draw instead of the current state.
+        """
+        timer = self.profiler
+        if timer is not None:
+            start = perf_counter()
+
         if render_state is None:
-            render_state = self.game_state
-        outfile = sys.stdout
-        arena = list()
-
-        # Add the boundaries and fill others positions with spaces.
-        for x in range(self.size):
-            row = list()
-            for y in range(self.size):
-                if x in [0, 19]:
-                    row.append("X")
-                elif y in [0, 19]:
-                    row.append("X")
-                else:
-                    row.append(".")
-            arena.append(row)
-
-        # Plug in the positions of the agent, robots and zappers.
-        a = render_state["agent"]
-        arena[a[0]][a[1]] = "A"
-        for r in render_state["robots"].values():
-            arena[r["location"][0]][r["location"][1]] = "R"
-        for z in render_state["zappers"].values():
-            arena[z[0]][z[1]] = "X"
-        output = "\n".join(["  ".join([col for col in row]) for row in arena])
-
-        outfile.write(output)
+            state = self._state
+        else:
+            state = ChaseState.from_observation(render_state, self.size)
+
+        if self.render_mode == "rgb_array":
+            output = self._render_rgb(state)
+        else:
+            output = self._render_text(state)
+        if timer is not None:
+            timer.add("render", start)
+
+        if self.render_mode in ("ansi", "rgb_array"):
+            return output
+        sys.stdout.write(output)
+
+    def _agent_visible(self, state: ChaseState) -> bool:
+        """True if the agent is inside the arena and not covered by a robot or zapper."""
+        a_x, a_y = state.agent.tolist()
+        if 0 <= a_x < self.size and 0 <= a_y < self.size:
+            covered = a_x * self.size + a_y in state.occupied
+            return not covered and state.walls.item(a_x, a_y) != ZAPPER
+        return False
+
+    def _render_text(self, state: ChaseState) -> str:
+        """Returns the text map of state."""
+        if state.zappers is not self._text_zappers:
+            # Squares are two spaces apart and each row ends with a newline.
+            background = np.full((self.size, 3 * self.size - 1), ord(" "), np.uint8)
+            background[:, -1] = ord("\n")
+            background[:, : 3 * self.size : 3] = _RENDER_CHARS[state.walls]
+            self._text_background = background
+            self._text_frame = background.copy()
+            self._text_zappers = state.zappers
+
+        # Draw the robots and agent over the boundary and zappers.
+        frame = self._text_frame
+        np.copyto(frame, self._text_background)
+        live = state.robots[state.active]
+        frame[live[:, 0], 3 * live[:, 1]] = ord("R")
+        if self._agent_visible(state):
+            frame[state.agent[0], 3 * state.agent[1]] = ord("A")
+        return frame.tobytes()[:-1].decode("ascii")
+
+    def _render_rgb(self, state: ChaseState) -> np.ndarray:
+        """Returns an RGB image of state in a reused buffer."""
+        scale = max(1, _FRAME_PIXELS // self.size)
+        if state.zappers is not self._rgb_zappers:
+            blocked = state.walls[..., None] != EMPTY
+            background = np.where(blocked, _ZAPPER_RGB, _EMPTY_RGB)
+            background = np.repeat(np.repeat(background, scale, 0), scale, 1)
+            self._rgb_background = background.astype(np.uint8)
+            self._rgb_frame = self._rgb_background.copy()
+            self._rgb_zappers = state.zappers
+
+        # View the image as (square x, pixel, square y, pixel, colour).
+        frame = self._rgb_frame
+        np.copyto(frame, self._rgb_background)
+        squares = frame.reshape(self.size, scale, self.size, scale, 3)
+        live = state.robots[state.active]
+        squares[live[:, 0], :, live[:, 1]] = _ROBOT_RGB
+        if self._agent_visible(state):
+            squares[state.agent[0], :, state.agent[1]] = _AGENT_RGB
+        return frame
+
+    @property
+    def game_state(self) -> Dict:
+        """The current game state as a nested Dict observation.
+
+        Assigning a Dict observation replaces the state, e.g. to project from a
+        saved position.
+        """
+        return self._state.to_observation()
+
+    @game_state.setter
+    def game_state(self, state: Dict) -> None:
+        self._state = ChaseState.from_observation(state, self.size)
 
     def get_state(self) -> Dict:
         """Returns the current game state."""
         return self.game_state
+
+    def stats(self) -> Dict:
+        """Returns the time spent in each phase of step, reset and render.
+
+        Each phase maps to its number of calls, total seconds and mean
+        microseconds. Empty unless the env was made with ``profile=True``.
+        Clear the counts with ``env.profiler.clear()``.
+        """
+        if self.profiler is None:
+            return {}
+        return self.profiler.stats()
+
+
+# Observation formats accepted by ChaseEnv(obs_mode=...).
+OBS_MODES = ("dict", "flat", "array", "grid")
+
+# Character code for the EMPTY, BOUNDARY and ZAPPER grid codes.
+_RENDER_CHARS = np.frombuffer(b".XX", dtype=np.uint8)
+
+# Approximate width of rgb_array frames in pixels and the colours used.
+_FRAME_PIXELS = 512
+_EMPTY_RGB = np.array([0, 0, 0], dtype=np.uint8)
+_ZAPPER_RGB = np.array([255, 200, 0], dtype=np.uint8)
+_ROBOT_RGB = np.array([220, 40, 40], dtype=np.uint8)
+_AGENT_RGB = np.array([40, 120, 255], dtype=np.uint8)
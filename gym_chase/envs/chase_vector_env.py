@@ -0,0 +1,198 @@
+"""Vectorized gym-chase environment running many arenas as NumPy arrays."""
+from typing import Dict as TDict
+from typing import Optional, Tuple
+
+import numpy as np
+from gymnasium.spaces import Box
+from gymnasium.spaces import Dict as DictSpace
+from gymnasium.spaces import Discrete
+from gymnasium.utils import seeding
+from gymnasium.vector import VectorEnv
+from gymnasium.vector.utils import batch_space
+
+from gym_chase.envs.chase_core import (
+    arena_keys,
+    batch_grids,
+    batch_safe_actions,
+    batch_step,
+    check_arena_size,
+    generate_arenas,
+)
+
+
+class ChaseVectorEnv(VectorEnv):
+    """Runs ``num_envs`` Chase arenas in lock step as batched array operations.
+
+    Agents, robots, alive flags and zappers for every arena are held in
+    contiguous arrays and stepped together by ``chase_core.batch_step``, so
+    the per step cost is a fixed number of NumPy calls whatever ``num_envs``.
+    Each arena follows the same rules as ``ChaseEnv.step``.
+
+    The observation for each arena is a Dict with:
+        - "agent": (2,) agent location;
+        - "robots": (robots, 3) rows of robot x, y and alive flag; and
+        - "zappers": (zappers, 2) zapper locations.
+
+    Arenas are reset automatically when they terminate. The observation
+    returned for that step is the new arena. As in gymnasium's vector envs,
+    ``info["final_observation"]`` is an object array holding the final
+    observation Dict of each terminated arena and None for the others, with
+    the mask ``info["_final_observation"]``, and ``info["final_info"]`` holds
+    an empty info Dict for each terminated arena.
+
+    ``reset(seed=s)`` generates arena ``i`` exactly as ``ChaseEnv.reset(seed=s + i)``
+    and later arenas use the seeds ``s + num_envs``, ``s + num_envs + 1``, ...
+    handed out in arena order as episodes end.
+
+    With ``action_mask=True`` info holds ``"action_mask"``, a (num_envs, 9)
+    int8 mask of the actions each agent survives, as in ChaseEnv, for the
+    observations returned.
+    """
+
+    metadata = {"render_modes": [], "autoreset": True}
+
+    def __init__(
+        self,
+        num_envs: int,
+        render_mode: Optional[str] = None,
+        size: int = 20,
+        robots: int = 5,
+        zappers: int = 10,
+        action_mask: bool = False,
+    ) -> None:
+        """Setup batched state arrays and spaces for ``num_envs`` arenas.
+
+        Args:
+            num_envs: number of arenas.
+            render_mode: rendering is not supported, kept for gymnasium.
+            size: width and height of each arena including the boundary.
+            robots: number of robots in each arena.
+            zappers: number of free standing zappers in each arena.
+            action_mask: add the (num_envs, 9) mask of safe actions to info.
+        """
+        check_arena_size(size, robots, zappers)
+        self.size = size
+        self.robots = robots
+        self.zappers = zappers
+        self.render_mode = render_mode
+        self.action_mask = action_mask
+
+        self.num_envs = num_envs
+        self.is_vector_env = True
+        self.closed = False
+        self.viewer = None
+        self.single_observation_space = DictSpace(
+            {
+                "agent": Box(0, self.size - 1, shape=(2,), dtype=np.int32),
+                "robots": Box(0, self.size - 1, shape=(self.robots, 3), dtype=np.int32),
+                "zappers": Box(
+                    0, self.size - 1, shape=(self.zappers, 2), dtype=np.int32
+                ),
+            }
+        )
+        self.single_action_space = Discrete(9)
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+        self.action_space = batch_space(self.single_action_space, num_envs)
+
+        self.agents = np.zeros((num_envs, 2), dtype=np.int32)
+        self.robot_locations = np.zeros((num_envs, self.robots, 2), dtype=np.int32)
+        self.alive = np.zeros((num_envs, self.robots), dtype=bool)
+        self.zapper_locations = np.zeros((num_envs, self.zappers, 2), dtype=np.int32)
+        self.blocked = np.zeros((num_envs, self.size, self.size), dtype=bool)
+        self.occupied = np.zeros((num_envs, self.size, self.size), dtype=bool)
+
+        self._np_random, _ = seeding.np_random()
+        self._next_seed = 0
+
+    def _reset_arenas(self, index: np.ndarray, seeds: np.ndarray) -> None:
+        """Load the arenas generated from seeds into the slots at index."""
+        agents, robots, zappers = generate_arenas(
+            arena_keys(seeds), self.size, self.robots, self.zappers
+        )
+        self.agents[index] = agents
+        self.robot_locations[index] = robots
+        self.zapper_locations[index] = zappers
+        self.alive[index] = True
+        self.blocked[index], self.occupied[index] = batch_grids(
+            robots, self.alive[index], zappers, self.size
+        )
+
+    def _safe_actions(self) -> np.ndarray:
+        """Returns the (num_envs, 9) mask of the actions each agent survives."""
+        return batch_safe_actions(self.agents, self.blocked, self.occupied)
+
+    def _observation(self) -> TDict[str, np.ndarray]:
+        """Returns a copy of the batched observation."""
+        robots = np.concatenate(
+            [self.robot_locations, self.alive[:, :, None].astype(np.int32)], axis=2
+        )
+        return {
+            "agent": self.agents.copy(),
+            "robots": robots,
+            "zappers": self.zapper_locations.copy(),
+        }
+
+    def reset(
+        self,
+        *,
+        seed: Optional[int] = None,
+        options: Optional[dict] = None,
+    ) -> Tuple[TDict[str, np.ndarray], dict]:
+        """Generate a new arena in every slot."""
+        if seed is not None:
+            self._np_random, _ = seeding.np_random(seed)
+        else:
+            seed = int(self._np_random.integers(2**31))
+
+        self._reset_arenas(np.arange(self.num_envs), seed + np.arange(self.num_envs))
+        self._next_seed = seed + self.num_envs
+
+        infos = {}
+        if self.action_mask:
+            infos["action_mask"] = self._safe_actions()
+        return self._observation(), infos
+
+    def step(
+        self, actions: np.ndarray
+    ) -> Tuple[TDict[str, np.ndarray], np.ndarray, np.ndarray, np.ndarray, dict]:
+        """Step every arena and reset the ones that terminated.
+
+        Raises:
+            ValueError: if any action is not between 0 and 8.
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        if ((actions < 0) | (actions > 8)).any():
+            raise ValueError(f"Actions must be between 0 and 8, got {actions}.")
+        rewards, terminated = batch_step(
+            self.agents,
+            self.robot_locations,
+            self.alive,
+            self.blocked,
+            self.occupied,
+            actions,
+        )
+        # Episodes are never truncated. Unless there is a wrapper with a move timer.
+        truncated = np.zeros(self.num_envs, dtype=bool)
+        infos = {}
+
+        done = np.flatnonzero(terminated)
+        if len(done):
+            final = self._observation()
+            infos["final_observation"] = np.full(self.num_envs, None, dtype=object)
+            infos["final_info"] = np.full(self.num_envs, None, dtype=object)
+            for i in done.tolist():
+                infos["final_observation"][i] = {
+                    key: value[i] for key, value in final.items()
+                }
+                infos["final_info"][i] = {}
+            infos["_final_observation"] = terminated.copy()
+            infos["_final_info"] = terminated.copy()
+            self._reset_arenas(done, self._next_seed + np.arange(len(done)))
+            self._next_seed += len(done)
+        if self.action_mask:
+            infos["action_mask"] = self._safe_actions()
+
+        return self._observation(), rewards, terminated, truncated, infos
+
+    def close_extras(self, **kwargs) -> None:
+        """Nothing to release, all arenas live in this process."""
@@ -0,0 +1,296 @@
+"""Trajectory recording and replay for gym-chase in chunked columnar files.
+
+``RecordTrajectories`` wraps a ChaseEnv and streams every real step into
+fixed size column buffers. When ``chunk_steps`` steps have been buffered
+they are written as one compressed ``.npz`` file, so memory use is bounded
+whatever the length of the recording. Each step is stored as:
+    - "episode": episode number;
+    - "action": action taken;
+    - "reward": reward received;
+    - "terminated": terminated flag; and
+    - "state": the packed state after the step, a row of the agent x, y, each
+      robot's x, y and then each robot's alive flag.
+
+Each episode is stored once, in the chunk it starts in, with its reset seed,
+first step, zappers and packed starting state. ``TrajectoryReader`` reads
+slices of steps across chunks and rebuilds any step by re-running
+``ChaseEnv.step`` from the episode seed and its recorded actions.
+"""
+import glob
+import json
+import os
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+import gymnasium as gym
+import numpy as np
+
+from gym_chase.envs import ChaseEnv, ChaseState
+from gym_chase.envs.chase_core import coordinate_dtype
+
+# Columns stored for every step and for every episode.
+STEP_COLUMNS = ("episode", "action", "reward", "terminated", "state")
+EPISODE_COLUMNS = ("episode_id", "seed", "start", "zappers", "initial_state")
+
+
+def _step_columns(steps: int, size: int, robots: int) -> Dict[str, np.ndarray]:
+    """Returns zeroed step columns for steps steps, in the dtypes they are stored in."""
+    coord = coordinate_dtype(size)
+    return {
+        "episode": np.zeros(steps, dtype=np.int64),
+        "action": np.zeros(steps, dtype=np.int8),
+        "reward": np.zeros(steps, dtype=np.int16),
+        "terminated": np.zeros(steps, dtype=bool),
+        "state": np.zeros((steps, 2 + 3 * robots), dtype=coord),
+    }
+
+
+def pack_state(state: ChaseState, out: np.ndarray) -> None:
+    """Writes the agent, robot locations and alive flags of state into a row."""
+    robots = len(state.robots)
+    out[:2] = state.agent
+    out[2 : 2 + 2 * robots] = state.robots.ravel()
+    out[2 + 2 * robots :] = state.alive
+
+
+class RecordTrajectories(gym.Wrapper):
+    """Records every step of a ChaseEnv to a directory of compressed chunks.
+
+    Episodes must be replayable from their seed, so a reset without a seed
+    draws one from the environment's generator and resets with it. Projected
+    steps are passed through and not recorded. Call ``close`` to write the
+    last partial chunk.
+
+    Example:
+        >>> env = RecordTrajectories(gym.make("gym_chase:Chase-v1").unwrapped, "run")
+        >>> env.reset(seed=0)
+        >>> env.step(4)
+        >>> env.close()
+    """
+
+    def __init__(self, env: gym.Env, directory: str, chunk_steps: int = 65536):
+        """Allocate the chunk buffers and write the recording metadata.
+
+        Args:
+            env: ChaseEnv to record, optionally wrapped.
+            directory: directory the chunks are written to. It must not hold
+                another recording.
+            chunk_steps: number of steps written to each chunk file.
+        """
+        super().__init__(env)
+        chase = env.unwrapped
+        self.directory = directory
+        self.chunk_steps = chunk_steps
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(os.path.join(directory, "meta.json")):
+            raise ValueError(f"{directory} already holds a recording.")
+
+        self.meta = {
+            "size": chase.size,
+            "robots": chase.robots,
+            "zappers": chase.zappers,
+            "chunks": [],
+        }
+        self._steps = _step_columns(chunk_steps, chase.size, chase.robots)
+        self._episodes = {name: [] for name in EPISODE_COLUMNS}
+        self._row = np.zeros_like(self._steps["state"][0])
+        self._filled = 0
+        self._total = 0
+        self._episode = -1
+        self._write_meta()
+
+    def _write_meta(self) -> None:
+        """Writes meta.json, replacing it in one step."""
+        path = os.path.join(self.directory, "meta.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(self.meta, f)
+        os.replace(path + ".tmp", path)
+
+    def _flush(self) -> None:
+        """Writes the buffered steps and episodes as the next chunk."""
+        if not self._filled and not self._episodes["episode_id"]:
+            return
+        chunk = len(self.meta["chunks"])
+        columns = {name: self._steps[name][: self._filled] for name in STEP_COLUMNS}
+        columns.update(
+            {
+                "episode_id": np.array(self._episodes["episode_id"], dtype=np.int64),
+                "seed": np.array(self._episodes["seed"], dtype=np.int64),
+                "start": np.array(self._episodes["start"], dtype=np.int64),
+                "zappers": np.array(
+                    self._episodes["zappers"], dtype=self._row.dtype
+                ).reshape(-1, self.meta["zappers"], 2),
+                "initial_state": np.array(
+                    self._episodes["initial_state"], dtype=self._row.dtype
+                ).reshape(-1, len(self._row)),
+            }
+        )
+        np.savez_compressed(
+            os.path.join(self.directory, f"chunk-{chunk:06d}.npz"), **columns
+        )
+        self.meta["chunks"].append(self._filled)
+        self._write_meta()
+        self._filled = 0
+        self._episodes = {name: [] for name in EPISODE_COLUMNS}
+
+    def reset(self, *, seed: Optional[int] = None, options: Optional[dict] = None):
+        """Resets the env and records the start of a new episode."""
+        if seed is None:
+            seed = int(self.env.unwrapped.np_random.integers(2**31))
+        observation, info = self.env.reset(seed=seed, options=options)
+
+        state = self.env.unwrapped._state
+        pack_state(state, self._row)
+        self._episode += 1
+        self._episodes["episode_id"].append(self._episode)
+        self._episodes["seed"].append(seed)
+        self._episodes["start"].append(self._total)
+        self._episodes["zappers"].append(state.zappers.copy())
+        self._episodes["initial_state"].append(self._row.copy())
+        return observation, info
+
+    def step(self, action, project: bool = False):
+        """Steps the env, recording the step unless it is a projection."""
+        if project:
+            return self.env.step(action, project=True)
+        observation, reward, terminated, truncated, info = self.env.step(action)
+
+        i = self._filled
+        steps = self._steps
+        steps["episode"][i] = self._episode
+        steps["action"][i] = action
+        steps["reward"][i] = reward
+        steps["terminated"][i] = terminated
+        pack_state(self.env.unwrapped._state, steps["state"][i])
+        self._filled += 1
+        self._total += 1
+        if self._filled == self.chunk_steps:
+            self._flush()
+        return observation, reward, terminated, truncated, info
+
+    def close(self) -> None:
+        """Writes the last chunk and closes the env."""
+        self._flush()
+        super().close()
+
+
+class TrajectoryReader:
+    """Reads a recording written by RecordTrajectories.
+
+    Steps are numbered across the whole recording. ``read`` and slicing only
+    load the chunks a range of steps falls in, and the most recently used
+    chunk is kept so sequential reads decompress each chunk once.
+    """
+
+    def __init__(self, directory: str) -> None:
+        """Read the recording metadata and the episode table.
+
+        Args:
+            directory: directory the recording was written to.
+        """
+        self.directory = directory
+        with open(os.path.join(directory, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.size = self.meta["size"]
+        self.robots = self.meta["robots"]
+        self.zappers = self.meta["zappers"]
+        self._offsets = np.concatenate([[0], np.cumsum(self.meta["chunks"])]).astype(
+            np.int64
+        )
+        self._chunk_index = None
+        self._chunk = None
+
+        episodes = {name: [] for name in EPISODE_COLUMNS}
+        for path in self._chunk_paths():
+            with np.load(path) as chunk:
+                for name in EPISODE_COLUMNS:
+                    episodes[name].append(chunk[name])
+        self.episodes = {
+            name: np.concatenate(columns) if columns else np.zeros(0, dtype=np.int64)
+            for name, columns in episodes.items()
+        }
+
+    def _chunk_paths(self) -> Sequence[str]:
+        """Returns the paths of the chunks listed in the metadata."""
+        paths = sorted(glob.glob(os.path.join(self.directory, "chunk-*.npz")))
+        return paths[: len(self.meta["chunks"])]
+
+    def _load(self, chunk: int) -> Dict[str, np.ndarray]:
+        """Returns the step columns of a chunk."""
+        if chunk != self._chunk_index:
+            path = os.path.join(self.directory, f"chunk-{chunk:06d}.npz")
+            with np.load(path) as data:
+                self._chunk = {name: data[name] for name in STEP_COLUMNS}
+            self._chunk_index = chunk
+        return self._chunk
+
+    def __len__(self) -> int:
+        """Returns the number of steps recorded."""
+        return int(self._offsets[-1])
+
+    @property
+    def num_episodes(self) -> int:
+        """Number of episodes recorded."""
+        return len(self.episodes["episode_id"])
+
+    def read(
+        self, start: int, stop: int, columns: Sequence[str] = STEP_COLUMNS
+    ) -> Dict[str, np.ndarray]:
+        """Returns the columns of steps start to stop as a Dict of arrays."""
+        start, stop, _ = slice(start, stop).indices(len(self))
+        if start >= stop:
+            empty = _step_columns(0, self.size, self.robots)
+            return {name: empty[name] for name in columns}
+        parts = {name: [] for name in columns}
+        first = np.searchsorted(self._offsets, start, side="right") - 1
+        for chunk in range(first, len(self.meta["chunks"])):
+            begin = self._offsets[chunk]
+            if begin >= stop:
+                break
+            data = self._load(chunk)
+            lo, hi = max(start - begin, 0), min(stop, self._offsets[chunk + 1]) - begin
+            for name in columns:
+                parts[name].append(data[name][lo:hi])
+        return {name: np.concatenate(part) for name, part in parts.items()}
+
+    def __getitem__(self, index: slice) -> Dict[str, np.ndarray]:
+        """Returns a slice of steps, see ``read``."""
+        if not isinstance(index, slice) or index.step not in (None, 1):
+            raise TypeError("Recordings are read with contiguous slices.")
+        start, stop, _ = index.indices(len(self))
+        return self.read(start, stop)
+
+    def iter_batches(
+        self, batch_size: int, columns: Sequence[str] = STEP_COLUMNS
+    ) -> Iterator[Dict[str, np.ndarray]]:
+        """Yields the recording in order as batches of up to batch_size steps."""
+        for start in range(0, len(self), batch_size):
+            yield self.read(start, start + batch_size, columns)
+
+    def episode_steps(self, episode: int) -> Tuple[int, int]:
+        """Returns the (start, stop) steps of an episode."""
+        starts = self.episodes["start"]
+        stop = starts[episode + 1] if episode + 1 < len(starts) else len(self)
+        return int(starts[episode]), int(stop)
+
+    def replay(self, episode: int, env: Optional[ChaseEnv] = None) -> Iterator[tuple]:
+        """Re-runs an episode, yielding the result of each ChaseEnv.step.
+
+        Args:
+            episode: episode number.
+            env: ChaseEnv to replay in, by default one matching the recording.
+        """
+        if env is None:
+            env = ChaseEnv(size=self.size, robots=self.robots, zappers=self.zappers)
+        env.reset(seed=int(self.episodes["seed"][episode]))
+        start, stop = self.episode_steps(episode)
+        for action in self.read(start, stop, ("action",))["action"].tolist():
+            yield env.step(action)
+
+    def rebuild(self, index: int) -> ChaseState:
+        """Returns the state after step index, rebuilt by re-running its episode."""
+        episode = int(self.read(index, index + 1, ("episode",))["episode"][0])
+        env = ChaseEnv(size=self.size, robots=self.robots, zappers=self.zappers)
+        start, _ = self.episode_steps(episode)
+        for _ in zip(range(start, index + 1), self.replay(episode, env)):
+            pass
+        return env._state
@@ -0,0 +1,549 @@
+"""Asyncio server and client hosting many gym-chase sessions over a socket.
+
+``ChaseServer`` holds every session's agent, robots, alive flags and walls
+in batched arrays, as ``ChaseVectorEnv`` does. Requests are fixed size
+binary records rather than JSON:
+    - "op": OPEN, RESET, STEP or CLOSE;
+    - "id": request number chosen by the client, echoed in the response;
+    - "session": session the request is for, ignored by OPEN; and
+    - "arg": seed for OPEN and RESET, -1 for a random one, or the action.
+
+Each response record, see ``response_dtype``, holds the echoed id, a
+status, the session, reward, terminated flag and the packed state of the
+session: agent, robot locations, alive flags and zappers. The server sends
+``HEADER`` with the arena size, robot and zapper counts when a client
+connects so it knows the response size.
+
+Clients may pipeline, sending any number of requests without waiting, and
+responses come back in request order. Requests from every connection that
+arrive together are answered by one batch, in which all the steps are made
+by a single ``chase_core.batch_step`` call. Start a server with:
+```
+> python -m gym_chase.server --unix /tmp/chase.sock
+```
+"""
+import argparse
+import asyncio
+import struct
+from collections import deque
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from gymnasium.utils import seeding
+
+from gym_chase.envs.chase_core import (
+    arena_keys,
+    batch_grids,
+    batch_step,
+    check_arena_size,
+    coordinate_dtype,
+    generate_arenas,
+)
+
+# Request operations.
+OPEN, RESET, STEP, CLOSE = range(4)
+
+# Response statuses.
+OK, UNKNOWN_SESSION, BAD_ACTION, FULL, BAD_OP = range(5)
+STATUS_MESSAGES = {
+    UNKNOWN_SESSION: "session is not open on this connection",
+    BAD_ACTION: "action must be between 0 and 8",
+    FULL: "the server holds its maximum number of sessions",
+    BAD_OP: "unknown operation",
+}
+
+REQUEST_DTYPE = np.dtype(
+    [("op", "u1"), ("id", "<u4"), ("session", "<u4"), ("arg", "<i8")]
+)
+
+# Arena size, robots and zappers, sent by the server when a client connects.
+HEADER = struct.Struct("<HHH")
+
+
+def response_dtype(size: int = 20, robots: int = 5, zappers: int = 10) -> np.dtype:
+    """Returns the record type of one response for an arena configuration."""
+    coord = coordinate_dtype(size)
+    return np.dtype(
+        [
+            ("id", "<u4"),
+            ("status", "u1"),
+            ("session", "<u4"),
+            ("reward", "<i2"),
+            ("terminated", "u1"),
+            ("agent", coord, (2,)),
+            ("robots", coord, (robots, 2)),
+            ("alive", "u1", (robots,)),
+            ("zappers", coord, (zappers, 2)),
+        ]
+    )
+
+
+class ChaseServer:
+    """Hosts Chase sessions for socket clients, stepping them in batches.
+
+    Each session is one arena following the rules of ``ChaseEnv.step``. A
+    session opened or reset with seed ``s`` starts from the arena of
+    ``ChaseEnv.reset(seed=s)``. Sessions are not reset when they terminate,
+    and they are closed when the connection that opened them closes.
+
+    ``process`` answers a batch of requests without any socket, the network
+    side only gathers the requests that arrive together and calls it.
+
+    Example:
+        >>> server = ChaseServer(max_sessions=10000)
+        >>> await server.start(path="/tmp/chase.sock")
+        >>> client = await ChaseClient.connect(path="/tmp/chase.sock")
+    """
+
+    def __init__(
+        self,
+        size: int = 20,
+        robots: int = 5,
+        zappers: int = 10,
+        max_sessions: int = 4096,
+    ) -> None:
+        """Allocate the session arrays.
+
+        Args:
+            size: width and height of the arenas including the boundary.
+            robots: number of robots in each arena.
+            zappers: number of free standing zappers in each arena.
+            max_sessions: most sessions open at once.
+        """
+        check_arena_size(size, robots, zappers)
+        self.size = size
+        self.robots = robots
+        self.zappers = zappers
+        self.max_sessions = max_sessions
+        self.response_dtype = response_dtype(size, robots, zappers)
+
+        self.agents = np.zeros((max_sessions, 2), dtype=np.int32)
+        self.robot_locations = np.zeros((max_sessions, robots, 2), dtype=np.int32)
+        self.alive = np.zeros((max_sessions, robots), dtype=bool)
+        self.zapper_locations = np.zeros((max_sessions, zappers, 2), dtype=np.int32)
+        self.blocked = np.zeros((max_sessions, size, size), dtype=bool)
+        self.occupied = np.zeros((max_sessions, size, size), dtype=bool)
+        # Connection that opened each session, -1 if the session is free.
+        self.owner = np.full(max_sessions, -1, dtype=np.int64)
+        self._free = list(range(max_sessions - 1, -1, -1))
+        self._np_random, _ = seeding.np_random()
+
+        self._server = None
+        self._batcher = None
+        self._pending = []
+        self._wakeup = asyncio.Event()
+        self._writers = {}
+        self._connections = set()
+        self._next_conn = 0
+
+    @property
+    def num_sessions(self) -> int:
+        """Number of open sessions."""
+        return self.max_sessions - len(self._free)
+
+    def _reset_sessions(self, sessions: np.ndarray, seeds: np.ndarray) -> None:
+        """Load new arenas generated from seeds into sessions, -1 for random."""
+        random = seeds < 0
+        seeds = np.where(
+            random, self._np_random.integers(2**31, size=len(seeds)), seeds
+        )
+        agents, robots, zappers = generate_arenas(
+            arena_keys(seeds), self.size, self.robots, self.zappers
+        )
+        self.agents[sessions] = agents
+        self.robot_locations[sessions] = robots
+        self.zapper_locations[sessions] = zappers
+        self.alive[sessions] = True
+        self.blocked[sessions], self.occupied[sessions] = batch_grids(
+            robots, self.alive[sessions], zappers, self.size
+        )
+
+    def _step_sessions(
+        self, sessions: np.ndarray, actions: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Steps distinct sessions with one batch_step call."""
+        agents = self.agents[sessions]
+        robots = self.robot_locations[sessions]
+        alive = self.alive[sessions]
+        occupied = self.occupied[sessions]
+        rewards, terminated = batch_step(
+            agents, robots, alive, self.blocked[sessions], occupied, actions
+        )
+        self.agents[sessions] = agents
+        self.robot_locations[sessions] = robots
+        self.alive[sessions] = alive
+        self.occupied[sessions] = occupied
+        return rewards, terminated
+
+    def close_sessions(self, conn: int) -> None:
+        """Closes every session opened by connection conn."""
+        for i in np.flatnonzero(self.owner == conn).tolist():
+            self.owner[i] = -1
+            self._free.append(i)
+
+    def process(self, requests: np.ndarray, conns: np.ndarray) -> np.ndarray:
+        """Answers a batch of requests.
+
+        Requests for the same session are applied in order. A session appears
+        at most once in each round of the batch, so every round is answered
+        with one vectorized step.
+
+        Args:
+            requests: records of REQUEST_DTYPE.
+            conns: connection each request came from.
+
+        Returns:
+            The response records, in the order of the requests.
+        """
+        n = len(requests)
+        responses = np.zeros(n, dtype=self.response_dtype)
+        responses["id"] = requests["id"]
+        ops = requests["op"]
+        sessions = requests["session"].astype(np.int64)
+        args = requests["arg"]
+
+        # Number each request by how many earlier requests share its session.
+        # Every OPEN gets a new session, so they all go in the first round.
+        keys = np.where(ops == OPEN, -1 - np.arange(n), sessions)
+        order = np.argsort(keys, kind="stable")
+        starts = np.r_[True, keys[order][1:] != keys[order][:-1]]
+        group = np.maximum.accumulate(np.where(starts, np.arange(n), 0))
+        rounds = np.empty(n, dtype=np.int64)
+        rounds[order] = np.arange(n) - group
+
+        for r in range(int(rounds.max(initial=-1)) + 1):
+            batch = np.flatnonzero(rounds == r)
+            known = sessions[batch] < self.max_sessions
+            owned = np.zeros(len(batch), dtype=bool)
+            owned[known] = self.owner[sessions[batch][known]] == conns[batch][known]
+            status = np.where(owned, OK, UNKNOWN_SESSION)
+            status[ops[batch] > CLOSE] = BAD_OP
+
+            for k in np.flatnonzero(ops[batch] == OPEN).tolist():
+                if self._free:
+                    sessions[batch[k]] = self._free.pop()
+                    self.owner[sessions[batch[k]]] = conns[batch[k]]
+                    status[k] = OK
+                else:
+                    status[k] = FULL
+
+            bad_action = (ops[batch] == STEP) & ((args[batch] < 0) | (args[batch] > 8))
+            status[bad_action & (status == OK)] = BAD_ACTION
+            responses["status"][batch] = status
+            ok = batch[status == OK]
+
+            resets = ok[(ops[ok] == OPEN) | (ops[ok] == RESET)]
+            if len(resets):
+                self._reset_sessions(sessions[resets], args[resets])
+
+            steps = ok[ops[ok] == STEP]
+            if len(steps):
+                rewards, terminated = self._step_sessions(sessions[steps], args[steps])
+                responses["reward"][steps] = rewards
+                responses["terminated"][steps] = terminated
+
+            self._pack(responses, ok, sessions[ok])
+
+            for i in ok[ops[ok] == CLOSE].tolist():
+                self.owner[sessions[i]] = -1
+                self._free.append(int(sessions[i]))
+
+        responses["session"] = sessions
+        return responses
+
+    def _pack(
+        self, responses: np.ndarray, index: np.ndarray, sessions: np.ndarray
+    ) -> None:
+        """Writes the state of sessions into the responses at index."""
+        responses["agent"][index] = self.agents[sessions]
+        responses["robots"][index] = self.robot_locations[sessions]
+        responses["alive"][index] = self.alive[sessions]
+        responses["zappers"][index] = self.zapper_locations[sessions]
+
+    async def start(
+        self, host: str = "127.0.0.1", port: int = 0, path: Optional[str] = None
+    ) -> asyncio.AbstractServer:
+        """Starts listening on a TCP port, or on a Unix socket if path is given.
+
+        Args:
+            host: address to listen on.
+            port: TCP port, 0 picks a free one, see ``address``.
+            path: Unix socket path to listen on instead of TCP.
+
+        Returns:
+            The asyncio server.
+        """
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._serve, path=path)
+        else:
+            self._server = await asyncio.start_server(self._serve, host, port)
+        self._batcher = asyncio.ensure_future(self._batch_loop())
+        return self._server
+
+    @property
+    def address(self):
+        """Address the server listens on, (host, port) or the socket path."""
+        return self._server.sockets[0].getsockname()
+
+    async def serve_forever(self) -> None:
+        """Serves clients until cancelled."""
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Stops listening, drops every connection and closes all sessions."""
+        self._server.close()
+        self._batcher.cancel()
+        for writer in list(self._writers.values()):
+            writer.close()
+        # Each connection sees the end of its stream and closes its sessions.
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        await self._server.wait_closed()
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Reads the requests of one connection until it closes."""
+        conn = self._next_conn
+        self._next_conn += 1
+        self._writers[conn] = writer
+        self._connections.add(asyncio.current_task())
+        writer.write(HEADER.pack(self.size, self.robots, self.zappers))
+        record = REQUEST_DTYPE.itemsize
+        buffer = b""
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                buffer += data
+                count = len(buffer) // record
+                if count:
+                    requests = np.frombuffer(buffer, REQUEST_DTYPE, count)
+                    buffer = buffer[count * record :]
+                    self._pending.append((conn, requests))
+                    self._wakeup.set()
+                # Stop reading while this connection's responses back up.
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            del self._writers[conn]
+            self._connections.discard(asyncio.current_task())
+            self.close_sessions(conn)
+            writer.close()
+
+    async def _batch_loop(self) -> None:
+        """Answers the pending requests of all connections in batches."""
+        while True:
+            await self._wakeup.wait()
+            # Let every connection with data waiting add it to this batch.
+            await asyncio.sleep(0)
+            self._wakeup.clear()
+            pending, self._pending = self._pending, []
+            requests = np.concatenate([part for _, part in pending])
+            conns = np.repeat(
+                [conn for conn, _ in pending], [len(part) for _, part in pending]
+            )
+            responses = self.process(requests, conns)
+
+            start = 0
+            for conn, part in pending:
+                writer = self._writers.get(conn)
+                if writer is not None and not writer.is_closing():
+                    writer.write(responses[start : start + len(part)].tobytes())
+                start += len(part)
+
+
+class ChaseClient:
+    """Asyncio client for a ChaseServer.
+
+    Every call sends its requests in a single write and waits for their
+    responses, so calls from many tasks can be in flight over one
+    connection at once. Observations are Dicts of arrays as in
+    ``ChaseEnv(obs_mode="array")``: "agent", "robots" as rows of x, y and
+    alive flag, and "zappers". The ``*_many`` calls return them batched.
+
+    Example:
+        >>> client = await ChaseClient.connect(port=port)
+        >>> session, obs = await client.open(seed=0)
+        >>> obs, reward, terminated = await client.step(session, 4)
+    """
+
+    def __init__(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, header: bytes
+    ) -> None:
+        """Use an open connection, see ``connect``.
+
+        Args:
+            reader: stream the responses are read from.
+            writer: stream the requests are written to.
+            header: HEADER sent by the server.
+        """
+        self.size, self.robots, self.zappers = HEADER.unpack(header)
+        self.response_dtype = response_dtype(self.size, self.robots, self.zappers)
+        self._reader = reader
+        self._writer = writer
+        self._calls = deque()
+        self._next_id = 0
+        self._receiver = asyncio.ensure_future(self._receive())
+
+    @classmethod
+    async def connect(
+        cls, host: str = "127.0.0.1", port: int = 0, path: Optional[str] = None
+    ) -> "ChaseClient":
+        """Connects to a server over TCP, or a Unix socket if path is given."""
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer, await reader.readexactly(HEADER.size))
+
+    async def _receive(self) -> None:
+        """Hands the responses to the calls waiting for them, oldest first."""
+        record = self.response_dtype.itemsize
+        buffer = b""
+        try:
+            while True:
+                data = await self._reader.read(65536)
+                if not data:
+                    raise ConnectionError("The server closed the connection.")
+                buffer += data
+                while self._calls and len(buffer) >= self._calls[0][0] * record:
+                    count, future = self._calls.popleft()
+                    responses = np.frombuffer(buffer, self.response_dtype, count)
+                    buffer = buffer[count * record :]
+                    if not future.cancelled():
+                        future.set_result(responses.copy())
+        except ConnectionError as error:
+            while self._calls:
+                _, future = self._calls.popleft()
+                if not future.done():
+                    future.set_exception(error)
+
+    async def request(
+        self, ops, sessions: Sequence[int], args: Sequence[int]
+    ) -> np.ndarray:
+        """Sends a batch of requests and returns their response records.
+
+        Raises:
+            RuntimeError: if the server rejected any of the requests.
+        """
+        sessions = np.asarray(sessions)
+        requests = np.zeros(len(sessions), dtype=REQUEST_DTYPE)
+        requests["op"] = ops
+        requests["id"] = np.arange(self._next_id, self._next_id + len(requests))
+        requests["session"] = sessions
+        requests["arg"] = args
+        self._next_id += len(requests)
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls.append((len(requests), future))
+        self._writer.write(requests.tobytes())
+        responses = await future
+        failed = responses["status"] != OK
+        if failed.any():
+            status = int(responses["status"][failed][0])
+            raise RuntimeError(f"Request failed: {STATUS_MESSAGES[status]}.")
+        return responses
+
+    def _observations(self, responses: np.ndarray) -> Dict[str, np.ndarray]:
+        """Returns the batched observations of response records."""
+        robots = np.concatenate(
+            [responses["robots"], responses["alive"][:, :, None]], axis=2
+        )
+        return {
+            "agent": responses["agent"].astype(np.int32),
+            "robots": robots.astype(np.int32),
+            "zappers": responses["zappers"].astype(np.int32),
+        }
+
+    @staticmethod
+    def _first(observations: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Returns the first observation of a batch."""
+        return {key: value[0] for key, value in observations.items()}
+
+    async def open_many(
+        self, seeds: Sequence[Optional[int]]
+    ) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Opens a session for each seed, None for a random arena.
+
+        Returns:
+            A tuple of the session numbers and their first observations.
+        """
+        seeds = [-1 if seed is None else seed for seed in seeds]
+        responses = await self.request(OPEN, np.zeros(len(seeds)), seeds)
+        return responses["session"].astype(np.int64), self._observations(responses)
+
+    async def open(self, seed: Optional[int] = None) -> Tuple[int, Dict]:
+        """Opens a session, see ``open_many``."""
+        sessions, observations = await self.open_many([seed])
+        return int(sessions[0]), self._first(observations)
+
+    async def reset_many(
+        self, sessions: Sequence[int], seeds: Sequence[Optional[int]]
+    ) -> Dict[str, np.ndarray]:
+        """Starts a new arena in each session and returns the observations."""
+        seeds = [-1 if seed is None else seed for seed in seeds]
+        return self._observations(await self.request(RESET, sessions, seeds))
+
+    async def reset(self, session: int, seed: Optional[int] = None) -> Dict:
+        """Starts a new arena in a session and returns its observation."""
+        return self._first(await self.reset_many([session], [seed]))
+
+    async def step_many(
+        self, sessions: Sequence[int], actions: Sequence[int]
+    ) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray]:
+        """Steps each session with its action.
+
+        Returns:
+            A tuple of the batched observations, rewards and terminated flags.
+        """
+        responses = await self.request(STEP, sessions, actions)
+        return (
+            self._observations(responses),
+            responses["reward"].astype(np.int64),
+            responses["terminated"].astype(bool),
+        )
+
+    async def step(self, session: int, action: int) -> Tuple[Dict, int, bool]:
+        """Steps a session, returning its observation, reward and terminated flag."""
+        observations, rewards, terminated = await self.step_many([session], [action])
+        return self._first(observations), int(rewards[0]), bool(terminated[0])
+
+    async def close_session(self, session: int) -> None:
+        """Closes a session, freeing it on the server."""
+        await self.request(CLOSE, [session], [0])
+
+    async def close(self) -> None:
+        """Closes the connection and with it every session it opened."""
+        self._writer.close()
+        await self._writer.wait_closed()
+        self._receiver.cancel()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Run a Chase server from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7000)
+    parser.add_argument("--unix", help="Unix socket path to listen on instead")
+    parser.add_argument("--size", type=int, default=20)
+    parser.add_argument("--robots", type=int, default=5)
+    parser.add_argument("--zappers", type=int, default=10)
+    parser.add_argument("--max-sessions", type=int, default=4096)
+    args = parser.parse_args(argv)
+
+    async def serve() -> None:
+        server = ChaseServer(args.size, args.robots, args.zappers, args.max_sessions)
+        await server.start(args.host, args.port, args.unix)
+        print(f"Serving Chase on {server.address}")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
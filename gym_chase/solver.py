@@ -0,0 +1,266 @@
+"""Exhaustive best play search for seeded gym-chase arenas.
+
+The solver labels the arenas generated by ``ChaseEnv.reset(seed=...)`` as
+winnable or not. An episode is won by eliminating every robot while the
+agent survives, which earns the largest possible return, one per robot. The
+search is breadth first, so the first win found uses the fewest moves.
+
+Each layer of the search is expanded in one vectorized call to
+``ChaseEnv.project_all_batch``. States are hashed on the agent, the live robot
+positions and the alive flags. Eliminated robots can never move or block
+anything again, so their positions are left out and states that differ only
+in where robots were zapped are merged. Moves that end the episode are not
+expanded, they are only scored. Seeds are solved in worker processes and the
+results can be cached on disk as JSON:
+```
+> python -m gym_chase.solver 0 100 --cache-dir solver_cache
+```
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from gym_chase.envs import ChaseEnv
+from gym_chase.envs.chase_core import ARENA_VERSION
+
+# Action that keeps the agent still, used for the step that ends a won episode.
+STAY = 4
+
+
+def _keys(agents: np.ndarray, robots: np.ndarray) -> List[bytes]:
+    """Returns a hash key for each state, ignoring eliminated robot positions."""
+    robots = robots.copy()
+    robots[:, :, :2] *= robots[:, :, 2:]
+    rows = np.concatenate(
+        [agents, robots.reshape(len(robots), robots.shape[1] * 3)], axis=1
+    )
+    rows = np.ascontiguousarray(rows, dtype=np.int16)
+    return rows.view(np.dtype((np.void, rows.shape[1] * 2))).ravel().tolist()
+
+
+def _actions(
+    parents: List[np.ndarray], moves: List[np.ndarray], index: int
+) -> List[int]:
+    """Follows parent links back from index in the last layer to the start."""
+    actions = []
+    for parent, move in zip(reversed(parents), reversed(moves)):
+        actions.append(int(move[index]))
+        index = parent[index]
+    return actions[::-1]
+
+
+def solve(
+    seed: int,
+    size: int = 20,
+    robots: int = 5,
+    zappers: int = 10,
+    max_depth: int = 200,
+    max_states: int = 1_000_000,
+) -> Dict:
+    """Searches for the best play from the arena of ``ChaseEnv.reset(seed=seed)``.
+
+    Args:
+        seed: seed of the arena.
+        size: width and height of the arena including the boundary.
+        robots: number of robots.
+        zappers: number of free standing zappers.
+        max_depth: most moves searched before giving up.
+        max_states: most distinct states visited before giving up.
+
+    Returns:
+        A Dict of:
+            - "seed": the seed solved;
+            - "winnable": True if every robot can be eliminated with the agent
+              surviving;
+            - "complete": True if the search proved its answer, False if it
+              ran out of depth or states without finding a win;
+            - "actions": the actions of the best episode found. For a win this
+              is the shortest and ends with the step that terminates it;
+            - "moves": the length of "actions";
+            - "return": the total reward of "actions", or None if no episode
+              ending was found; and
+            - "states": the number of distinct states visited.
+    """
+    env = ChaseEnv(size=size, robots=robots, zappers=zappers, obs_mode="array")
+    observation, _ = env.reset(seed=seed)
+    frontier = {
+        "agent": observation["agent"][None].copy(),
+        "robots": observation["robots"][None].copy(),
+        "zappers": observation["zappers"][None].copy(),
+    }
+    visited = set(_keys(frontier["agent"], frontier["robots"]))
+    parents, moves = [], []
+    best_return, best_actions = None, []
+
+    while len(parents) < max_depth and len(frontier["agent"]):
+        successors, rewards, terminated = env.project_all_batch(frontier)
+        m, actions = rewards.shape
+        agents = successors["agent"].reshape(m * actions, 2)
+        robot_rows = successors["robots"].reshape(m * actions, robots, 3)
+        rewards, terminated = rewards.ravel(), terminated.ravel()
+
+        # Score the moves that end the episode. Up to here every robot lost
+        # has been zapped with the agent surviving, one reward each.
+        kills = robots - frontier["robots"][:, :, 2].sum(axis=1)
+        returns = np.repeat(kills, actions) + rewards
+        ending = np.flatnonzero(terminated)
+        if len(ending):
+            top = ending[np.argmax(returns[ending])]
+            if best_return is None or returns[top] > best_return:
+                best_return = int(returns[top])
+                best_actions = _actions(parents, moves, top // actions)
+                best_actions.append(int(top % actions))
+
+        # Keep the unseen states the episode carries on from.
+        keep = []
+        for i, key in zip(
+            np.flatnonzero(~terminated).tolist(),
+            _keys(agents[~terminated], robot_rows[~terminated]),
+        ):
+            if key not in visited:
+                visited.add(key)
+                keep.append(i)
+        keep = np.array(keep, dtype=np.int64)
+        parents.append(keep // actions)
+        moves.append(keep % actions)
+        frontier = {
+            "agent": agents[keep],
+            "robots": robot_rows[keep],
+            "zappers": np.broadcast_to(
+                observation["zappers"], (len(keep),) + observation["zappers"].shape
+            ),
+        }
+
+        won = np.flatnonzero(~frontier["robots"][:, :, 2].any(axis=1))
+        if len(won):
+            # Every robot is gone, standing still ends the episode unharmed.
+            return {
+                "seed": seed,
+                "winnable": True,
+                "complete": True,
+                "actions": _actions(parents, moves, won[0]) + [STAY],
+                "moves": len(parents) + 1,
+                "return": robots,
+                "states": len(visited),
+            }
+        if len(visited) > max_states:
+            break
+
+    return {
+        "seed": seed,
+        "winnable": False,
+        "complete": not len(frontier["agent"]),
+        "actions": best_actions,
+        "moves": len(best_actions),
+        "return": best_return,
+        "states": len(visited),
+    }
+
+
+def _cache_path(cache_dir: str, **config) -> str:
+    """Returns the cache file for a solver configuration and arena generator."""
+    name = "-".join(f"{key}{value}" for key, value in sorted(config.items()))
+    return os.path.join(cache_dir, f"chase-v{ARENA_VERSION}-{name}.json")
+
+
+def solve_seeds(
+    seeds: Iterable[int],
+    workers: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+    size: int = 20,
+    robots: int = 5,
+    zappers: int = 10,
+    max_depth: int = 200,
+    max_states: int = 1_000_000,
+) -> List[Dict]:
+    """Solves many seeds in worker processes, see ``solve``.
+
+    Args:
+        seeds: seeds to solve.
+        workers: number of worker processes, defaults to the CPU count.
+        cache_dir: directory holding a JSON cache of results for each
+            configuration. Cached seeds are not solved again, unless the cache
+            was written for another version of the arena generator.
+        size: width and height of the arena including the boundary.
+        robots: number of robots.
+        zappers: number of free standing zappers.
+        max_depth: most moves searched before giving up.
+        max_states: most distinct states visited before giving up.
+
+    Returns:
+        A list of the result Dict for each seed, in the order given.
+    """
+    seeds = list(seeds)
+    config = dict(
+        size=size,
+        robots=robots,
+        zappers=zappers,
+        max_depth=max_depth,
+        max_states=max_states,
+    )
+    cached = {}
+    if cache_dir is not None:
+        path = _cache_path(cache_dir, **config)
+        if os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            if data.get("version") == ARENA_VERSION:
+                cached = {int(seed): result for seed, result in data["results"].items()}
+
+    todo = sorted(set(seeds) - set(cached))
+    if todo:
+        with ProcessPoolExecutor(workers) as executor:
+            futures = [executor.submit(solve, seed, **config) for seed in todo]
+            for future in futures:
+                result = future.result()
+                cached[result["seed"]] = result
+
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Write then rename so an interrupted run never leaves a bad cache.
+            with open(path + ".tmp", "w") as f:
+                results = {str(seed): cached[seed] for seed in sorted(cached)}
+                json.dump({"version": ARENA_VERSION, "results": results}, f)
+            os.replace(path + ".tmp", path)
+
+    return [cached[seed] for seed in seeds]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Solve a range of seeds and print a summary of each."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("start", type=int, help="first seed")
+    parser.add_argument("stop", type=int, help="seed to stop before")
+    parser.add_argument("--workers", type=int, help="number of worker processes")
+    parser.add_argument("--cache-dir", help="directory to cache results in")
+    parser.add_argument("--size", type=int, default=20)
+    parser.add_argument("--robots", type=int, default=5)
+    parser.add_argument("--zappers", type=int, default=10)
+    parser.add_argument("--max-depth", type=int, default=200)
+    parser.add_argument("--max-states", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    results = solve_seeds(
+        range(args.start, args.stop),
+        workers=args.workers,
+        cache_dir=args.cache_dir,
+        size=args.size,
+        robots=args.robots,
+        zappers=args.zappers,
+        max_depth=args.max_depth,
+        max_states=args.max_states,
+    )
+    print(f"{'seed':>6} {'winnable':>9} {'complete':>9} {'moves':>6} {'return':>7}")
+    for result in results:
+        print(
+            f"{result['seed']:>6} {str(result['winnable']):>9} "
+            f"{str(result['complete']):>9} {result['moves']:>6} {str(result['return']):>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -7,4 +7,13 @@ setup(
     version="0.0.2",
     packages=["gym_chase", "gym_chase.envs"],
     install_requires=["gymnasium"],  # Add any other dependencies Chase needs
+    entry_points={
+        "console_scripts": [
+            "chase-bench = gym_chase.bench:main",
+            "chase-solve = gym_chase.solver:main",
+            "chase-arena-bank = gym_chase.arena_bank:main",
+            "chase-server = gym_chase.server:main",
+        ],
+        "gymnasium.envs": ["__root__ = gym_chase:register_envs"],
+    },
 )
@@ -67,3 +67,18 @@ def test_chase_environment(env: gym.Env) -> None:
             # Then take a random action.
             action = env.action_space.sample()
             state, reward, terminated, truncated, info = env.step(action, False)
+
+
+def test_invalid_actions(env: gym.Env) -> None:
+    """Test actions outside 0 to 8 are rejected for steps and projections.
+
+    Args:
+        env: An unwrapped Chase-v1 instance.
+    """
+    env.reset(seed=0)
+    before = state_to_json(env.game_state)
+    for action in [-1, 9]:
+        for project in [False, True]:
+            with pytest.raises(ValueError):
+                env.step(action, project=project)
+    assert state_to_json(env.game_state) == before, "Rejected action changed state."
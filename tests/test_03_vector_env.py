@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+from tqdm import tqdm
+
+from gym_chase.envs import ChaseEnv, ChaseVectorEnv
+
+
+def state_to_arrays(state):
+    """Convert a ChaseEnv observation to the ChaseVectorEnv layout.
+
+    Args:
+        state: A ChaseEnv observation.
+
+    Returns:
+        A tuple of agent, robots and zappers arrays.
+    """
+    robots = np.array(
+        [
+            [r["location"][0], r["location"][1], r["alive"]]
+            for r in state["robots"].values()
+        ]
+    )
+    zappers = np.array(list(state["zappers"].values()))
+    return np.asarray(state["agent"]), robots, zappers
+
+
+@pytest.fixture
+def num_envs() -> int:
+    """Number of arenas to run side by side."""
+    return 16
+
+
+def test_vector_env_matches_chase_env(num_envs: int) -> None:
+    """Test ChaseVectorEnv produces the same episodes as ChaseEnv.
+
+    This test performs the following checks:
+
+    1. Resets a vector env and one ChaseEnv per arena with matching seeds.
+    2. Steps both with the same random actions and compares observations, rewards and terminated flags.
+    3. Follows the vector env autoreset seeds so episodes keep matching after arenas are reset.
+    4. final_observation holds the final observation of each ended arena only.
+
+    Args:
+        num_envs: Number of arenas in the vector env.
+    """
+    seed = 100
+    vec_env = ChaseVectorEnv(num_envs=num_envs)
+    envs = [ChaseEnv() for _ in range(num_envs)]
+    rng = np.random.default_rng(0)
+
+    obs, _ = vec_env.reset(seed=seed)
+    for i, env in enumerate(envs):
+        env.reset(seed=seed + i)
+    next_seed = seed + num_envs
+
+    for _ in tqdm(range(500), desc="Vector v single steps"):
+        actions = rng.integers(0, 9, size=num_envs)
+        obs, rewards, terminated, truncated, info = vec_env.step(actions)
+        assert not truncated.any(), "Vector env truncated an episode."
+
+        for i, env in enumerate(envs):
+            state, reward, done, _, _ = env.step(int(actions[i]))
+            assert rewards[i] == reward, "Reward differs from ChaseEnv."
+            assert terminated[i] == done, "Terminated differs from ChaseEnv."
+
+            if done:
+                # Compare the final observation then follow the autoreset.
+                final = info["final_observation"][i]
+                agent, robots, _ = state_to_arrays(state)
+                assert np.array_equal(final["agent"], agent), "Agent differs."
+                assert np.array_equal(final["robots"], robots), "Robots differ."
+                state, _ = env.reset(seed=next_seed)
+                next_seed += 1
+            elif "final_observation" in info:
+                assert info["final_observation"][i] is None, "Arena did not end."
+
+            agent, robots, zappers = state_to_arrays(state)
+            assert np.array_equal(obs["agent"][i], agent), "Agent differs."
+            assert np.array_equal(obs["robots"][i], robots), "Robots differ."
+            assert np.array_equal(obs["zappers"][i], zappers), "Zappers differ."
+
+
+def test_vector_env_spaces(num_envs: int) -> None:
+    """Test the vector env observations are within its observation space.
+
+    Args:
+        num_envs: Number of arenas in the vector env.
+    """
+    vec_env = ChaseVectorEnv(num_envs=num_envs)
+    obs, _ = vec_env.reset(seed=0)
+    assert vec_env.observation_space.contains(obs), "Reset obs outside space."
+    obs, *_ = vec_env.step(vec_env.action_space.sample())
+    assert vec_env.observation_space.contains(obs), "Step obs outside space."
+    with pytest.raises(ValueError):
+        vec_env.step(np.full(num_envs, -1))
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from tqdm import tqdm
+
+from gym_chase.envs import ChaseEnv
+from gym_chase.envs.chase_core import ChaseState
+
+
+@pytest.fixture
+def env() -> ChaseEnv:
+    """Create a new ChaseEnv instance."""
+    return ChaseEnv()
+
+
+def test_grid_tracks_state(env: ChaseEnv) -> None:
+    """Test the collision lookups are kept in line with the robots and zappers.
+
+    This test performs the following checks:
+
+    1. After every real step the occupied map and active list equal ones rebuilt from scratch.
+    2. The walls grid equals one rebuilt from scratch.
+    3. Projected steps leave the lookups of the real state untouched.
+    4. Copies share the read only walls grid.
+
+    Args:
+        env: A ChaseEnv instance.
+    """
+    for e in tqdm(range(200), desc="Occupancy grid episodes"):
+        terminated = False
+        env.reset(seed=e)
+        while not terminated:
+            before = (dict(env._state.occupied), list(env._state.active))
+            for action in range(9):
+                env.step(action, project=True)
+            state = env._state
+            assert (state.occupied, state.active) == before, "Projection changed state."
+            assert state.copy().walls is state.walls, "Copy did not share walls."
+            assert not state.walls.flags.writeable, "Walls are writeable."
+
+            _, _, terminated, _, _ = env.step(env.action_space.sample())
+            state = env._state
+            rebuilt = ChaseState.from_arrays(
+                state.agent, state.robots, state.alive, state.zappers, env.size
+            )
+            assert state.occupied == rebuilt.occupied, "Occupied map out of step."
+            assert state.active == rebuilt.active, "Active robots out of step."
+            assert np.array_equal(state.walls, rebuilt.walls), "Walls out of step."
+
+
+def test_observations_are_writable(env: ChaseEnv) -> None:
+    """Test states never freeze arrays handed in or handed out.
+
+    This test performs the following checks:
+
+    1. from_arrays leaves the caller's zapper array writable.
+    2. Every array of a "dict" observation is a writable copy.
+
+    Args:
+        env: A ChaseEnv instance.
+    """
+    zappers = np.array([[3, 4], [5, 6]], dtype=np.int32)
+    state = ChaseState.from_arrays(
+        np.array([1, 1]), np.array([[2, 2]]), np.array([1], np.int8), zappers, 20
+    )
+    assert zappers.flags.writeable, "Caller's zappers were frozen."
+    assert not state.zappers.flags.writeable, "State zappers are writeable."
+
+    observation, _ = env.reset(seed=0)
+    observation["zappers"][0][0] = 0
+    observation["robots"][0]["location"][0] = 0
+    observation["agent"][0] = 0
+    assert env._state.zappers[0, 0] != 0, "Observation shares the zappers."
+    assert env._state.robots[0, 0] != 0, "Observation shares the robots."
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from gym_chase.envs import ChaseEnv
+
+
+@pytest.fixture
+def env() -> ChaseEnv:
+    """Create a new ChaseEnv instance."""
+    return ChaseEnv()
+
+
+def test_arena_generation(env: ChaseEnv) -> None:
+    """Test generated arenas are valid and reproducible.
+
+    This test performs the following checks:
+
+    1. Every zapper, robot and the agent is on its own interior square.
+    2. The same seed always generates the same arena.
+    3. Resetting another env in between does not change the arena generated.
+
+    Args:
+        env: A ChaseEnv instance.
+    """
+    other = ChaseEnv()
+    for e in range(500):
+        state, _ = env.reset(seed=e)
+        squares = [tuple(state["agent"])]
+        squares += [tuple(r["location"]) for r in state["robots"].values()]
+        squares += [tuple(z) for z in state["zappers"].values()]
+        assert len(squares) == 1 + env.robots + env.zappers, "Missing squares."
+        assert len(set(squares)) == len(squares), "Squares are not distinct."
+        assert all(
+            0 < x < env.size - 1 and 0 < y < env.size - 1 for x, y in squares
+        ), "Square outside the interior."
+
+        other.reset(seed=e + 1)
+        again, _ = env.reset(seed=e)
+        assert np.array_equal(again["agent"], state["agent"]), "Agent differs."
+        for r in state["robots"]:
+            assert np.array_equal(
+                again["robots"][r]["location"], state["robots"][r]["location"]
+            ), "Robot differs."
@@ -0,0 +1,70 @@
+import gymnasium as gym
+import numpy as np
+import pytest
+from tqdm import tqdm
+
+from gym_chase.envs import ChaseEnv, ChaseVectorEnv
+
+
+@pytest.mark.parametrize(
+    "size,robots,zappers", [(8, 2, 3), (32, 12, 30), (64, 60, 150)]
+)
+def test_configured_arena(size: int, robots: int, zappers: int) -> None:
+    """Test arenas built from the size, robots and zappers arguments.
+
+    This test performs the following checks:
+
+    1. gym.make passes the arguments through to the env and its spaces.
+    2. Random episodes stay inside the observation space and give valid rewards.
+    3. The vector env with the same arguments matches the single env.
+
+    Args:
+        size: Width and height of the arena.
+        robots: Number of robots.
+        zappers: Number of zappers.
+    """
+    env = gym.make("gym_chase:Chase-v1", size=size, robots=robots, zappers=zappers)
+    chase = env.unwrapped
+    assert (chase.size, chase.robots, chase.zappers) == (size, robots, zappers)
+    assert len(env.observation_space["robots"].spaces) == robots
+    assert len(env.observation_space["zappers"].spaces) == zappers
+
+    for e in tqdm(range(50), desc=f"Size {size} episodes"):
+        state, _ = env.reset(seed=e)
+        terminated = False
+        while not terminated:
+            state, reward, terminated, _, _ = env.step(env.action_space.sample())
+            assert -1 <= reward <= robots, "Invalid reward value."
+
+    num_envs = 4
+    vec_env = ChaseVectorEnv(num_envs, size=size, robots=robots, zappers=zappers)
+    vec_env.reset(seed=0)
+    singles = [
+        ChaseEnv(size=size, robots=robots, zappers=zappers) for _ in range(num_envs)
+    ]
+    for i, single in enumerate(singles):
+        single.reset(seed=i)
+    # Compare each arena until its first episode ends and it is reset.
+    running = [True] * num_envs
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        actions = rng.integers(0, 9, size=num_envs)
+        obs, rewards, terminated, _, _ = vec_env.step(actions)
+        for i, single in enumerate(singles):
+            if not running[i]:
+                continue
+            state, reward, done, _, _ = single.step(int(actions[i]))
+            assert rewards[i] == reward, "Reward differs from ChaseEnv."
+            assert terminated[i] == done, "Terminated differs from ChaseEnv."
+            if done:
+                running[i] = False
+            else:
+                assert np.array_equal(obs["agent"][i], state["agent"])
+
+
+def test_arena_too_small() -> None:
+    """Test an arena without room for every robot and zapper is rejected."""
+    with pytest.raises(ValueError):
+        ChaseEnv(size=4, robots=2, zappers=3)
+    with pytest.raises(ValueError):
+        ChaseVectorEnv(2, size=2)
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+from tqdm import tqdm
+
+from gym_chase.envs import ChaseEnv
+
+
+def dict_to_arrays(state):
+    """Convert a "dict" observation to the agent, robots and zappers arrays.
+
+    Args:
+        state: A "dict" mode observation.
+
+    Returns:
+        A tuple of agent, robots and zappers arrays.
+    """
+    robots = np.array(
+        [[*r["location"], r["alive"]] for r in state["robots"].values()]
+    ).reshape(-1, 3)
+    zappers = np.array(list(state["zappers"].values())).reshape(-1, 2)
+    return np.asarray(state["agent"]), robots, zappers
+
+
+@pytest.mark.parametrize("obs_mode", ["flat", "array", "grid"])
+def test_obs_mode_matches_dict(obs_mode: str) -> None:
+    """Test the array observation modes hold the same state as the "dict" mode.
+
+    This test performs the following checks:
+
+    1. Every observation is inside the mode's observation space.
+    2. The observation carries the same agent, robots and zappers as the "dict" observation.
+    3. The same preallocated buffer is returned every step.
+
+    Args:
+        obs_mode: The observation mode under test.
+    """
+    env = ChaseEnv(obs_mode=obs_mode)
+    reference = ChaseEnv()
+    size = env.size
+
+    for e in tqdm(range(100), desc=f"{obs_mode} episodes"):
+        obs, _ = env.reset(seed=e)
+        state, _ = reference.reset(seed=e)
+        buffer = obs
+        terminated = False
+        while not terminated:
+            assert env.observation_space.contains(obs), "Obs outside space."
+            assert obs is buffer, "Observation buffer was reallocated."
+            agent, robots, zappers = dict_to_arrays(state)
+
+            if obs_mode == "flat":
+                expected = np.concatenate([agent, robots.ravel(), zappers.ravel()])
+                assert np.array_equal(obs, expected), "Flat obs differs."
+            elif obs_mode == "array":
+                assert np.array_equal(obs["agent"], agent), "Agent differs."
+                assert np.array_equal(obs["robots"], robots), "Robots differ."
+                assert np.array_equal(obs["zappers"], zappers), "Zappers differ."
+            else:
+                expected = np.zeros((3, size, size), dtype=np.uint8)
+                expected[0, [0, -1], :] = 1
+                expected[0, :, [0, -1]] = 1
+                expected[0, zappers[:, 0], zappers[:, 1]] = 1
+                live = robots[robots[:, 2] == 1]
+                expected[1, live[:, 0], live[:, 1]] = 1
+                if ((agent >= 0) & (agent < size)).all():
+                    expected[2, agent[0], agent[1]] = 1
+                assert np.array_equal(obs, expected), "Grid obs differs."
+
+            action = env.action_space.sample()
+            obs, reward, terminated, _, _ = env.step(action)
+            state, ref_reward, ref_terminated, _, _ = reference.step(action)
+            assert reward == ref_reward and terminated == ref_terminated
+
+
+def test_unknown_obs_mode() -> None:
+    """Test an unknown obs_mode is rejected."""
+    with pytest.raises(ValueError):
+        ChaseEnv(obs_mode="pixels")
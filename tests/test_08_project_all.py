@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from tqdm import tqdm
+
+from gym_chase.envs import ChaseEnv
+
+
+def assert_matches_step(env: ChaseEnv, successors, rewards, terminated, m=None):
+    """Assert projected successors match step(action, project=True) from env's state.
+
+    Args:
+        env: The env whose current state was projected.
+        successors: Successor Dict from project_all or project_all_batch.
+        rewards: Projected rewards.
+        terminated: Projected terminated flags.
+        m: Row of a project_all_batch result to check, None for project_all.
+    """
+    index = () if m is None else (m,)
+    for action in range(9):
+        state, reward, done, _, _ = env.step(action, project=True)
+        row = index + (action,)
+        assert rewards[row] == reward, "Projected reward differs."
+        assert terminated[row] == done, "Projected terminated differs."
+        assert np.array_equal(successors["agent"][row], state["agent"])
+        for r, robot in state["robots"].items():
+            assert np.array_equal(successors["robots"][row][r, :2], robot["location"])
+            assert successors["robots"][row][r, 2] == robot["alive"]
+        for z, zapper in state["zappers"].items():
+            assert np.array_equal(successors["zappers"][row][z], zapper)
+
+
+@pytest.fixture
+def env() -> ChaseEnv:
+    """Create a new ChaseEnv instance."""
+    return ChaseEnv()
+
+
+def test_project_all(env: ChaseEnv) -> None:
+    """Test project_all matches projecting each action with step.
+
+    This test performs the following checks:
+
+    1. Each row of project_all matches step(action, project=True) from the current state.
+    2. project_all leaves the current state unchanged.
+    3. project_all_batch over states from many episodes matches step for every state.
+
+    Args:
+        env: A ChaseEnv instance.
+    """
+    observations = []
+    for e in tqdm(range(200), desc="Project all episodes"):
+        state, _ = env.reset(seed=e)
+        terminated = False
+        while not terminated:
+            before = env.game_state
+            successors, rewards, terminated_all = env.project_all()
+            assert_matches_step(env, successors, rewards, terminated_all)
+            assert np.array_equal(env.game_state["agent"], before["agent"])
+
+            # Keep some states for the batched projection.
+            if len(observations) < 300:
+                observations.append(before)
+            state, _, terminated, _, _ = env.step(env.action_space.sample())
+
+    states = {
+        "agent": np.array([o["agent"] for o in observations]),
+        "robots": np.array(
+            [
+                [[*r["location"], r["alive"]] for r in o["robots"].values()]
+                for o in observations
+            ]
+        ),
+        "zappers": np.array([list(o["zappers"].values()) for o in observations]),
+    }
+    successors, rewards, terminated_all = env.project_all_batch(states)
+    assert rewards.shape == (len(observations), 9)
+    for m, observation in enumerate(observations):
+        env.game_state = observation
+        assert_matches_step(env, successors, rewards, terminated_all, m)
@@ -0,0 +1,66 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+from tqdm import tqdm
+
+from gym_chase.envs import ChaseEnv, chase_transition, decode_state, encode_state
+
+
+def step_encoded(data: bytes, action: int):
+    """Step an encoded state in a worker process.
+
+    Args:
+        data: A state packed by encode_state.
+        action: Action to take.
+
+    Returns:
+        The packed next state, reward and terminated flag.
+    """
+    next_state, reward, terminated = chase_transition(decode_state(data), action)
+    return encode_state(next_state), reward, terminated
+
+
+@pytest.fixture
+def env() -> ChaseEnv:
+    """Create a new ChaseEnv instance."""
+    return ChaseEnv()
+
+
+def test_chase_transition(env: ChaseEnv) -> None:
+    """Test the pure transition function and state encoding.
+
+    This test performs the following checks:
+
+    1. chase_transition matches env.step and does not change the state passed in.
+    2. decode_state(encode_state(state)) restores the state and its lookups.
+    3. Encoded states can be stepped in a process pool with the same results.
+
+    Args:
+        env: A ChaseEnv instance.
+    """
+    jobs = []
+    for e in tqdm(range(200), desc="Transition episodes"):
+        env.reset(seed=e)
+        terminated = False
+        while not terminated:
+            state = env._state
+            data = encode_state(state)
+            restored = decode_state(data)
+            assert encode_state(restored) == data, "Encoding does not round trip."
+            assert np.array_equal(restored.walls, state.walls), "Walls not restored."
+            assert restored.occupied == state.occupied, "Occupied map not restored."
+
+            action = int(env.action_space.sample())
+            next_state, reward, done = chase_transition(state, action)
+            assert encode_state(state) == data, "chase_transition changed its input."
+            jobs.append((data, action, encode_state(next_state), reward, done))
+
+            _, env_reward, terminated, _, _ = env.step(action)
+            assert (reward, done) == (env_reward, terminated)
+            assert encode_state(env._state) == encode_state(next_state)
+
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        results = pool.map(step_encoded, *zip(*[job[:2] for job in jobs[:500]]))
+        for job, result in zip(jobs, results):
+            assert result == job[2:], "Worker result differs."
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from tqdm import tqdm
+
+from gym_chase.envs import ChaseEnv, TransitionCache
+
+
+@pytest.fixture
+def env() -> ChaseEnv:
+    """Create a ChaseEnv instance with a small transition cache."""
+    return ChaseEnv(transition_cache=64)
+
+
+def test_cached_projection_matches(env: ChaseEnv) -> None:
+    """Test cached projections give the same results as uncached ones.
+
+    This test performs the following checks:
+
+    1. Projecting every action twice gives identical results and the second pass hits the cache.
+    2. The cache never grows past its capacity and evicts the oldest entries.
+
+    Args:
+        env: A ChaseEnv instance with a transition cache.
+    """
+    reference = ChaseEnv()
+    for e in tqdm(range(100), desc="Cached projection episodes"):
+        env.reset(seed=e)
+        reference.reset(seed=e)
+        terminated = False
+        while not terminated:
+            for _ in range(2):
+                for action in range(9):
+                    state, reward, done, _, _ = env.step(action, project=True)
+                    expected, ref_reward, ref_done, _, _ = reference.step(
+                        action, project=True
+                    )
+                    assert (reward, done) == (ref_reward, ref_done)
+                    assert np.array_equal(state["agent"], expected["agent"])
+                    for r in state["robots"]:
+                        assert np.array_equal(
+                            state["robots"][r]["location"],
+                            expected["robots"][r]["location"],
+                        )
+            assert len(env.transition_cache) <= 64, "Cache grew past capacity."
+
+            action = env.action_space.sample()
+            _, _, terminated, _, _ = env.step(action)
+            reference.step(action)
+
+    stats = env.transition_cache.stats()
+    assert stats["hits"] >= stats["misses"], "Second projections missed the cache."
+    assert stats["evictions"] == stats["misses"] - stats["size"]
+
+
+def test_lru_eviction() -> None:
+    """Test the least recently used entry is evicted first."""
+    cache = TransitionCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None, "Least recently used entry was kept."
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats() == {
+        "capacity": 2,
+        "size": 2,
+        "hits": 3,
+        "misses": 1,
+        "evictions": 1,
+    }
+    with pytest.raises(ValueError):
+        TransitionCache(0)
@@ -0,0 +1,27 @@
+import json
+
+from gym_chase import bench
+
+
+def test_bench_quick(tmp_path) -> None:
+    """Test a quick benchmark run writes every result to JSON.
+
+    Args:
+        tmp_path: Directory for the JSON output.
+    """
+    output = tmp_path / "bench.json"
+    bench.main(["--quick", "--output", str(output)])
+
+    report = json.loads(output.read_text())
+    results = report["results"]
+    for key in [
+        "reset_us",
+        "step_per_sec",
+        "project_per_sec",
+        "render_us",
+        "render_rgb_us",
+    ]:
+        assert results[key] > 0, f"{key} was not measured."
+    assert results["phases"]["project.rules"]["calls"] > 0
+    assert [row["num_envs"] for row in results["vector_scaling"]] == [1, 16]
+    assert all(row["env_steps_per_sec"] > 0 for row in results["scaling"])
@@ -0,0 +1,79 @@
+import contextlib
+import io
+
+import pytest
+
+from gym_chase.envs import ChaseEnv
+
+
+def expected_text(state, size: int) -> str:
+    """Build the text map of a "dict" observation square by square.
+
+    Args:
+        state: A "dict" observation.
+        size: Arena size.
+
+    Returns:
+        The expected text map.
+    """
+    arena = [
+        ["X" if x in (0, size - 1) or y in (0, size - 1) else "." for y in range(size)]
+        for x in range(size)
+    ]
+    a_x, a_y = state["agent"]
+    if arena[a_x][a_y] in ".X":
+        arena[a_x][a_y] = "A"
+    for robot in state["robots"].values():
+        if robot["alive"]:
+            arena[robot["location"][0]][robot["location"][1]] = "R"
+    for z_x, z_y in state["zappers"].values():
+        arena[z_x][z_y] = "X"
+    return "\n".join("  ".join(row) for row in arena)
+
+
+@pytest.mark.parametrize("size", [20, 33])
+def test_render_modes(size: int) -> None:
+    """Test the human, ansi and rgb_array render modes.
+
+    This test performs the following checks:
+
+    1. "ansi" returns the text map, "human" and no render mode write the same
+       text to stdout.
+    2. "rgb_array" colours each robot and the agent's square and reuses its buffer.
+
+    Args:
+        size: Arena size.
+    """
+    envs = {
+        mode: ChaseEnv(render_mode=mode, size=size)
+        for mode in ChaseEnv.metadata["render_modes"] + [None]
+    }
+    for e in range(50):
+        for env in envs.values():
+            state, _ = env.reset(seed=e)
+        terminated = False
+        frame = envs["rgb_array"].render()
+        while not terminated:
+            text = envs["ansi"].render()
+            assert text == expected_text(state, size), "Text map differs."
+            for mode in ["human", None]:
+                with contextlib.redirect_stdout(io.StringIO()) as out:
+                    assert envs[mode].render() is None
+                assert out.getvalue() == text, f"{mode} render differs from ansi."
+
+            image = envs["rgb_array"].render()
+            assert image is frame, "rgb_array buffer was reallocated."
+            scale = image.shape[0] // size
+            rows = text.split("\n")
+            for x in range(size):
+                for y in range(size):
+                    pixel = image[x * scale, y * scale]
+                    char = rows[x][3 * y]
+                    if char == ".":
+                        assert not pixel.any(), "Empty square is coloured."
+                    else:
+                        assert pixel.any(), "Occupied square is not coloured."
+
+            action = envs["ansi"].action_space.sample()
+            for env in envs.values():
+                state, _, terminated, _, _ = env.step(action)
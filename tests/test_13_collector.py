@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from tqdm import tqdm
+
+from gym_chase.collector import ChaseCollector
+from gym_chase.envs import ChaseEnv
+
+
+@pytest.fixture
+def collector() -> ChaseCollector:
+    """Create a ChaseCollector with two workers of three envs."""
+    collector = ChaseCollector(num_workers=2, envs_per_worker=3, horizon=16)
+    yield collector
+    collector.close()
+
+
+def test_collector_matches_env(collector: ChaseCollector) -> None:
+    """Test the collector writes the same transitions as local ChaseEnvs.
+
+    This test performs the following checks:
+
+    1. Reset observations equal ChaseEnv.reset(seed=seed + i).
+    2. Synchronous steps, wrapping around the ring buffer, match local envs.
+    3. A rollout chosen by the workers replays exactly on local envs.
+    4. Stepping during a rollout raises without writing to shared memory.
+    5. Waiting with no rollout running raises instead of blocking.
+
+    Args:
+        collector: A ChaseCollector instance.
+    """
+    envs = [ChaseEnv(obs_mode="flat") for _ in range(collector.num_envs)]
+    obs = collector.reset(seed=7)
+    for i, env in enumerate(envs):
+        expected, _ = env.reset(seed=7 + i)
+        assert np.array_equal(obs[i], expected), "Reset observation differs."
+
+    def replay(actions, obs, rewards, terminated):
+        for i, env in enumerate(envs):
+            expected, reward, done, _, _ = env.step(actions[i])
+            if done:
+                expected, _ = env.reset()
+            assert np.array_equal(obs[i], expected), "Observation differs."
+            assert rewards[i] == reward and terminated[i] == done, "Step differs."
+
+    rng = np.random.default_rng(0)
+    for _ in tqdm(range(40), desc="Collector steps"):
+        actions = rng.integers(0, 9, size=collector.num_envs)
+        step = collector.step(actions)
+        replay(actions, *step)
+    last = step[0].copy()
+
+    batch = collector.rollout(15)
+    assert batch["obs"].shape == (16, collector.num_envs, collector.obs_dim)
+    assert np.array_equal(batch["obs"][0], last), "Rollout did not start from obs."
+    for t in range(15):
+        replay(
+            batch["actions"][t],
+            batch["obs"][t + 1],
+            batch["rewards"][t],
+            batch["terminated"][t],
+        )
+
+    collector.start_rollout(5)
+    slot = (collector._slot + 1) % collector.horizon
+    before = collector.buffers["actions"][slot].copy()
+    with pytest.raises(RuntimeError):
+        collector.step(np.full(collector.num_envs, 8))
+    assert np.array_equal(collector.buffers["actions"][slot], before)
+    collector.wait()
+    with pytest.raises(RuntimeError):
+        collector.wait()
@@ -0,0 +1,78 @@
+import itertools
+import json
+
+import pytest
+from tqdm import tqdm
+
+from gym_chase import solver
+from gym_chase.envs import ChaseEnv, chase_transition
+
+ARENA = dict(size=8, robots=2, zappers=3)
+
+
+def win_within(state, moves: int) -> bool:
+    """Returns True if every robot can be eliminated in moves without dying.
+
+    Args:
+        state: ChaseState to search from.
+        moves: number of moves allowed.
+    """
+    for actions in itertools.product(range(9), repeat=moves):
+        current = state
+        for action in actions:
+            current, _, terminated = chase_transition(current, action)
+            if terminated:
+                break
+            if not current.alive.any():
+                return True
+    return False
+
+
+def test_solver(tmp_path, monkeypatch) -> None:
+    """Test the solver labels seeds correctly and caches the results.
+
+    This test performs the following checks:
+
+    1. Replaying the actions found in ChaseEnv gives the reported return and
+       only terminates on the last action.
+    2. Winnable seeds return one reward per robot and no shorter win exists.
+    3. A second call is answered from the cache without starting workers.
+    4. A cache written for another arena generator version is not used.
+
+    Args:
+        tmp_path: Temporary directory for the cache.
+        monkeypatch: Used to stop worker processes being started.
+    """
+    seeds = range(16)
+    results = solver.solve_seeds(seeds, workers=2, cache_dir=tmp_path, **ARENA)
+    assert [result["seed"] for result in results] == list(seeds)
+    assert any(r["winnable"] for r in results) and not all(
+        r["winnable"] for r in results
+    ), "Expected a mix of winnable and unwinnable seeds."
+
+    env = ChaseEnv(**ARENA)
+    for result in tqdm(results, desc="Solver seeds"):
+        assert result["complete"], "Small arenas should be searched completely."
+        env.reset(seed=result["seed"])
+        start = env._state.copy()
+        total = 0
+        for i, action in enumerate(result["actions"]):
+            _, reward, terminated, _, _ = env.step(action)
+            total += reward
+            assert terminated == (i == len(result["actions"]) - 1)
+        assert total == result["return"], "Return does not match the replay."
+        assert result["winnable"] == (total == ARENA["robots"])
+        if result["winnable"] and result["moves"] <= 5:
+            assert not win_within(start, result["moves"] - 2), "Shorter win exists."
+
+    def no_workers(*args, **kwargs):
+        raise AssertionError("Cached seeds were solved again.")
+
+    monkeypatch.setattr(solver, "ProcessPoolExecutor", no_workers)
+    assert solver.solve_seeds(seeds, cache_dir=tmp_path, **ARENA) == results
+
+    (path,) = tmp_path.glob("*.json")
+    data = json.loads(path.read_text())
+    path.write_text(json.dumps({**data, "version": data["version"] - 1}))
+    with pytest.raises(AssertionError, match="solved again"):
+        solver.solve_seeds(seeds, cache_dir=tmp_path, **ARENA)
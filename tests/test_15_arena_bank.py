@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from tqdm import tqdm
+
+from gym_chase import arena_bank
+from gym_chase.arena_bank import bank_dtype, build_bank
+from gym_chase.envs import ChaseEnv
+from gym_chase.envs.chase_core import encode_state
+
+
+@pytest.fixture
+def bank_path(tmp_path) -> str:
+    """Build a bank of the first 300 seeds."""
+    path = str(tmp_path / "arenas.npy")
+    build_bank(path, 300, workers=2, chunk=64)
+    return path
+
+
+def test_arena_bank(bank_path: str, tmp_path, monkeypatch) -> None:
+    """Test resetting from an arena bank gives the generated arenas.
+
+    This test performs the following checks:
+
+    1. reset(seed=i) from the bank gives the arena ChaseEnv.reset(seed=i) generates.
+    2. Seeds past the end of the bank are generated.
+    3. Unseeded resets give an arena from the bank.
+    4. A bank with the wrong arena size, number of robots or zappers is rejected.
+    5. A bank built by another arena generator version is rejected.
+
+    Args:
+        bank_path: Path of a bank of 300 seeds.
+        tmp_path: Temporary directory for an outdated bank.
+        monkeypatch: Used to build a bank with another generator version.
+    """
+    env = ChaseEnv()
+    bank_env = ChaseEnv(arena_bank=bank_path)
+    assert bank_env.arena_bank.dtype == bank_dtype()
+
+    for seed in tqdm(range(310), desc="Arena bank seeds"):
+        env.reset(seed=seed)
+        bank_env.reset(seed=seed)
+        assert encode_state(bank_env._state) == encode_state(env._state)
+        assert np.array_equal(bank_env._state.walls, env._state.walls)
+
+    agents = bank_env.arena_bank["agent"]
+    for _ in range(20):
+        bank_env.reset()
+        assert (agents == bank_env._state.agent).all(axis=1).any()
+
+    for config in [{"robots": 4}, {"zappers": 9}, {"size": 21}]:
+        with pytest.raises(ValueError):
+            ChaseEnv(arena_bank=bank_path, **config)
+
+    old_path = str(tmp_path / "old.npy")
+    with monkeypatch.context() as patch:
+        patch.setattr(arena_bank, "ARENA_VERSION", arena_bank.ARENA_VERSION - 1)
+        build_bank(old_path, 10, workers=1)
+    with pytest.raises(ValueError, match="generator version"):
+        ChaseEnv(arena_bank=old_path)
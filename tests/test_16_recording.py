@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from tqdm import tqdm
+
+from gym_chase.envs import ChaseEnv
+from gym_chase.recording import RecordTrajectories, TrajectoryReader, pack_state
+
+
+def test_record_and_replay(tmp_path) -> None:
+    """Test trajectories are recorded in chunks and replay exactly.
+
+    This test performs the following checks:
+
+    1. Every real step is recorded, projections are not, across chunk boundaries.
+    2. Slices and batches read back the recorded columns.
+    3. Replaying each episode from its seed and actions gives the recorded steps.
+    4. Rebuilt states match the packed states, including after unseeded resets.
+    5. A directory that already holds a recording is refused.
+
+    Args:
+        tmp_path: Temporary directory for the recording.
+    """
+    directory = str(tmp_path / "run")
+    env = RecordTrajectories(ChaseEnv(), directory, chunk_steps=50)
+    row = np.zeros(2 + 3 * 5, dtype=np.int8)
+    expected = {"action": [], "reward": [], "terminated": [], "state": []}
+
+    for e in tqdm(range(40), desc="Recorded episodes"):
+        env.reset(seed=e if e % 2 else None)
+        terminated = False
+        while not terminated:
+            env.step(0, project=True)
+            action = int(env.action_space.sample())
+            _, reward, terminated, _, _ = env.step(action)
+            pack_state(env.unwrapped._state, row)
+            for name, value in zip(expected, (action, reward, terminated, row.copy())):
+                expected[name].append(value)
+    env.close()
+
+    reader = TrajectoryReader(directory)
+    assert len(reader) == len(expected["action"]) and reader.num_episodes == 40
+    full = reader[:]
+    for name, values in expected.items():
+        assert np.array_equal(full[name], np.array(values)), f"{name} differs."
+    batches = list(reader.iter_batches(37))
+    assert np.array_equal(np.concatenate([b["state"] for b in batches]), full["state"])
+    assert np.array_equal(reader[45:55]["action"], full["action"][45:55])
+
+    for episode in range(reader.num_episodes):
+        start, stop = reader.episode_steps(episode)
+        replayed = list(reader.replay(episode))
+        assert len(replayed) == stop - start
+        assert [step[1] for step in replayed] == full["reward"][start:stop].tolist()
+        assert [step[2] for step in replayed] == full["terminated"][start:stop].tolist()
+
+    for index in np.random.default_rng(0).integers(0, len(reader), size=20):
+        pack_state(reader.rebuild(int(index)), row)
+        assert np.array_equal(row, full["state"][index]), "Rebuilt state differs."
+
+    with pytest.raises(ValueError):
+        RecordTrajectories(ChaseEnv(), directory)
+
+
+def test_empty_recording(tmp_path) -> None:
+    """Test a recording without steps reads back as empty columns.
+
+    Args:
+        tmp_path: Temporary directory for the recording.
+    """
+    directory = str(tmp_path / "empty")
+    RecordTrajectories(ChaseEnv(), directory).close()
+    reader = TrajectoryReader(directory)
+    assert len(reader) == 0 and reader.num_episodes == 0
+    columns = reader[:]
+    assert columns["state"].shape == (0, 2 + 3 * 5)
+    assert all(len(column) == 0 for column in columns.values())
+    assert list(reader.iter_batches(10)) == []
@@ -0,0 +1,66 @@
+import numpy as np
+from tqdm import tqdm
+
+from gym_chase.envs import ChaseEnv
+
+
+def test_phase_profiling() -> None:
+    """Test the opt-in profiling of step, reset and render phases.
+
+    This test performs the following checks:
+
+    1. Without profiling stats() is empty.
+    2. Profiling does not change observations, rewards or terminated flags.
+    3. Each phase counts one call per step, projection, reset or render.
+    4. The projection cache phase is only recorded with a cache, and clear() resets the counts.
+    """
+    plain = ChaseEnv()
+    profiled = ChaseEnv(render_mode="ansi", profile=True)
+    assert plain.stats() == {} and plain.profiler is None
+
+    steps = projections = resets = 0
+    rng = np.random.default_rng(0)
+    for e in tqdm(range(50), desc="Profiled episodes"):
+        plain.reset(seed=e)
+        profiled.reset(seed=e)
+        resets += 1
+        terminated = False
+        while not terminated:
+            for action in range(9):
+                expected = plain.step(action, project=True)
+                assert profiled.step(action, project=True)[1:3] == expected[1:3]
+            projections += 9
+            profiled.render()
+            action = int(rng.integers(9))
+            expected = plain.step(action)
+            outcome = profiled.step(action)
+            assert outcome[1:3] == expected[1:3]
+            assert (
+                profiled.game_state["agent"].tolist() == expected[0]["agent"].tolist()
+            )
+            terminated = outcome[2]
+            steps += 1
+
+    stats = profiled.stats()
+    expected_calls = {
+        "step.rules": steps,
+        "step.observation": steps,
+        "project.copy": projections,
+        "project.rules": projections,
+        "project.observation": projections,
+        "reset.seed": resets,
+        "reset.generate": resets,
+        "reset.observation": resets,
+        "render": steps,
+    }
+    assert {phase: row["calls"] for phase, row in stats.items()} == expected_calls
+    assert all(row["total_s"] > 0 and row["mean_us"] > 0 for row in stats.values())
+
+    cached = ChaseEnv(transition_cache=100, profile=True)
+    cached.reset(seed=0)
+    cached.step(4, project=True)
+    cached.step(4, project=True)
+    assert cached.stats()["project.cache"]["calls"] == 2
+    assert cached.stats()["project.rules"]["calls"] == 1
+    cached.profiler.clear()
+    assert cached.stats() == {}
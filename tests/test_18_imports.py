@@ -0,0 +1,94 @@
+import json
+import subprocess
+import sys
+
+# Import time budgets in seconds, measured after numpy is loaded. Both imports
+# take a few milliseconds, loading gymnasium alone takes around 100.
+CORE_BUDGET = 0.05
+PACKAGE_BUDGET = 0.02
+
+# Imports gym_chase.envs.chase_core in the installed configuration and reports
+# the time taken and the gym_chase and gymnasium modules loaded.
+CORE_IMPORT = """
+import json, sys, time
+import numpy as np
+start = time.perf_counter()
+from gym_chase.envs.chase_core import (
+    ChaseState, arena_keys, chase_transition, generate_arenas
+)
+elapsed = time.perf_counter() - start
+arena = [locations[0] for locations in generate_arenas(arena_keys(0))]
+state = ChaseState.from_arena(*arena, 20)
+chase_transition(state, 4)
+modules = [m for m in sys.modules if m.startswith("gym") and sys.modules[m]]
+print(json.dumps({"seconds": elapsed, "modules": modules}))
+"""
+
+# Imports gym_chase, then gymnasium and makes an env, reporting whether
+# gymnasium and the env module were loaded at each point.
+PACKAGE_IMPORT = """
+import json, sys, time
+import numpy as np
+start = time.perf_counter()
+import gym_chase
+elapsed = time.perf_counter() - start
+gymnasium = "gymnasium" in sys.modules
+loaded = "gym_chase.envs.chase_env" in sys.modules
+import gymnasium as gym
+gym.make("Chase-v1")
+made = "gym_chase.envs.chase_env" in sys.modules
+print(json.dumps(
+    {"seconds": elapsed, "gymnasium": gymnasium, "loaded": loaded, "made": made}
+))
+"""
+
+# Imports gymnasium before gym_chase and makes an env both ways.
+GYMNASIUM_FIRST = """
+import json
+import gymnasium as gym
+import gym_chase
+envs = [gym.make(name).unwrapped for name in ("Chase-v1", "gym_chase:Chase-v1")]
+print(json.dumps([type(env).__name__ for env in envs]))
+"""
+
+
+def run(code: str) -> dict:
+    """Runs code in a fresh interpreter and returns the JSON it prints.
+
+    Args:
+        code: Python source to run.
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout)
+
+
+def test_import_budget() -> None:
+    """Test importing the package is lazy and stays within a time budget.
+
+    This test performs the following checks:
+
+    1. The core engine imports and steps without gymnasium, loading no env modules.
+    2. Importing gym_chase loads neither gymnasium nor the env module.
+    3. Importing gymnasium registers Chase-v1 and gym.make imports the env module.
+    4. Chase-v1 is registered when gymnasium is imported before gym_chase.
+    5. Both imports finish within budgets that loading gymnasium would exceed.
+    """
+    core = run(CORE_IMPORT)
+    assert sorted(core["modules"]) == [
+        "gym_chase",
+        "gym_chase.envs",
+        "gym_chase.envs.chase_core",
+    ], "The core engine imported more than it needs."
+    assert core["seconds"] < CORE_BUDGET, f"Core import took {core['seconds']:.3f}s."
+
+    package = run(PACKAGE_IMPORT)
+    assert not package["gymnasium"], "import gym_chase loaded gymnasium."
+    assert not package["loaded"], "import gym_chase loaded the env module."
+    assert package["made"], "gym.make did not load the env module."
+    assert (
+        package["seconds"] < PACKAGE_BUDGET
+    ), f"Package import took {package['seconds']:.3f}s."
+
+    assert run(GYMNASIUM_FIRST) == ["ChaseEnv", "ChaseEnv"]
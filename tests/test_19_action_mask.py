@@ -0,0 +1,66 @@
+import numpy as np
+from tqdm import tqdm
+
+from gym_chase.envs import ChaseEnv, ChaseVectorEnv
+
+# Episodes played with the mask and threat map.
+EPISODES = 100
+
+
+def test_action_mask() -> None:
+    """Test the safe action mask and threat map added to info.
+
+    This test performs the following checks:
+
+    1. Without the flags info holds no mask or threat map.
+    2. The threat map marks exactly the squares within one move of a live robot.
+    3. An action is in the mask exactly when projecting it leaves the agent alive.
+    4. The vector env mask matches the mask of ChaseEnv for every arena.
+    """
+    plain = ChaseEnv()
+    _, info = plain.reset(seed=0)
+    assert "action_mask" not in info and "threat_map" not in info
+    assert set(plain.step(4)[4]) == {"project"}
+
+    env = ChaseEnv(action_mask=True, threat_map=True)
+    squares = np.indices((env.size, env.size)).transpose(1, 2, 0)
+    rng = np.random.default_rng(0)
+    for e in tqdm(range(EPISODES), desc="Masked episodes"):
+        _, info = env.reset(seed=e)
+        terminated = False
+        while not terminated:
+            state = env._state
+            robots = state.robots[state.active]
+            distance = np.abs(squares[:, :, None, :] - robots).max(axis=3)
+            assert (info["threat_map"] == (distance <= 1).any(axis=2)).all()
+
+            live = len(state.active)
+            for action in range(9):
+                _, r, done, _, _ = env.step(action, project=True)
+                eliminated = done if live else r == -1
+                assert info["action_mask"][action] == (not eliminated)
+            if not info["action_mask"].any():
+                action = 4
+            else:
+                action = int(env.action_space.sample(info["action_mask"]))
+            if rng.random() < 0.1:
+                action = int(rng.integers(9))
+            _, _, terminated, _, info = env.step(action)
+
+    vector = ChaseVectorEnv(num_envs=8, action_mask=True)
+    scalars = [ChaseEnv(action_mask=True) for _ in range(8)]
+    _, infos = vector.reset(seed=0)
+    masks = [env.reset(seed=i)[1]["action_mask"] for i, env in enumerate(scalars)]
+    next_seed = 8
+    for _ in tqdm(range(500), desc="Vector masks"):
+        assert (infos["action_mask"] == np.stack(masks)).all()
+        actions = rng.integers(9, size=8)
+        _, _, terminated, _, infos = vector.step(actions)
+        for i, env in enumerate(scalars):
+            _, _, done, _, info = env.step(int(actions[i]))
+            assert done == terminated[i]
+            if done:
+                _, info = env.reset(seed=next_seed)
+                next_seed += 1
+            masks[i] = info["action_mask"]
+    assert next_seed > 8
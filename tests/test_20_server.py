@@ -0,0 +1,183 @@
+import asyncio
+
+import numpy as np
+import pytest
+from tqdm import tqdm
+
+from gym_chase.envs import ChaseEnv
+from gym_chase.server import (
+    OPEN,
+    REQUEST_DTYPE,
+    STEP,
+    UNKNOWN_SESSION,
+    ChaseClient,
+    ChaseServer,
+)
+
+# Batches of repeated session requests checked against ChaseEnv.
+BATCHES = 20
+
+
+def assert_observation(observation: dict, expected: dict) -> None:
+    """Assert an observation from the server equals one from ChaseEnv."""
+    for key in ["agent", "robots", "zappers"]:
+        assert np.array_equal(observation[key], expected[key]), f"{key} differs."
+
+
+async def play(client: ChaseClient, seed: int, steps: int) -> None:
+    """Plays sessions through the client alongside local ChaseEnvs.
+
+    Every round half the sessions take one step_many call while the other
+    half take concurrent single step calls, all pipelined on one connection.
+    Terminated sessions are reset with the next seed.
+    """
+    count = 8
+    envs = [ChaseEnv(obs_mode="array") for _ in range(count)]
+    sessions, observations = await client.open_many(range(seed, seed + count))
+    for i, env in enumerate(envs):
+        expected, _ = env.reset(seed=seed + i)
+        assert_observation({k: v[i] for k, v in observations.items()}, expected)
+
+    rng = np.random.default_rng(seed)
+    next_seed = seed + count
+    half = count // 2
+    for _ in range(steps):
+        actions = rng.integers(9, size=count)
+        batched, single = await asyncio.gather(
+            client.step_many(sessions[:half], actions[:half]),
+            asyncio.gather(
+                *[
+                    client.step(int(session), int(action))
+                    for session, action in zip(sessions[half:], actions[half:])
+                ]
+            ),
+        )
+        results = [
+            ({k: v[i] for k, v in batched[0].items()}, batched[1][i], batched[2][i])
+            for i in range(half)
+        ] + single
+        for i, env in enumerate(envs):
+            expected, reward, terminated, _, _ = env.step(int(actions[i]))
+            assert_observation(results[i][0], expected)
+            assert results[i][1:] == (reward, terminated)
+            if terminated:
+                observation = await client.reset(int(sessions[i]), next_seed)
+                expected, _ = env.reset(seed=next_seed)
+                assert_observation(observation, expected)
+                next_seed += 1
+
+
+def test_server_matches_env(tmp_path) -> None:
+    """Test sessions on the server play exactly as local ChaseEnvs.
+
+    This test performs the following checks:
+
+    1. Sessions opened or reset with a seed start from ChaseEnv.reset(seed=seed).
+    2. Pipelined step_many calls and concurrent single steps from several
+       clients over TCP match ChaseEnv.step.
+    3. The same holds over a Unix socket.
+    4. Closing a client closes its sessions.
+
+    Args:
+        tmp_path: Directory for the Unix socket.
+    """
+
+    async def run() -> None:
+        server = ChaseServer(max_sessions=64)
+        await server.start()
+        host, port = server.address[:2]
+        clients = [await ChaseClient.connect(host, port) for _ in range(3)]
+        await asyncio.gather(
+            *[play(client, 100 * c, 50) for c, client in enumerate(clients)]
+        )
+        assert server.num_sessions == 24
+        await clients[0].close()
+        await asyncio.sleep(0.1)
+        assert server.num_sessions == 16
+        await server.close()
+
+        path = str(tmp_path / "chase.sock")
+        server = ChaseServer(max_sessions=64)
+        await server.start(path=path)
+        client = await ChaseClient.connect(path=path)
+        await play(client, 1000, 50)
+        await client.close()
+        await server.close()
+
+    asyncio.run(run())
+
+
+def test_server_errors() -> None:
+    """Test the server rejects bad requests and keeps serving.
+
+    This test performs the following checks:
+
+    1. Stepping a session of another connection or an unknown session fails.
+    2. Actions outside 0 to 8 fail.
+    3. Opening more than max_sessions sessions fails.
+    4. Closed sessions can not be stepped and are opened again.
+    """
+
+    async def run() -> None:
+        server = ChaseServer(max_sessions=2)
+        await server.start()
+        host, port = server.address[:2]
+        owner = await ChaseClient.connect(host, port)
+        other = await ChaseClient.connect(host, port)
+        session, _ = await owner.open(seed=0)
+
+        with pytest.raises(RuntimeError, match="not open"):
+            await other.step(session, 4)
+        with pytest.raises(RuntimeError, match="not open"):
+            await owner.step(99, 4)
+        with pytest.raises(RuntimeError, match="between 0 and 8"):
+            await owner.step(session, 9)
+        await other.open()
+        with pytest.raises(RuntimeError, match="maximum"):
+            await owner.open()
+
+        await owner.close_session(session)
+        with pytest.raises(RuntimeError, match="not open"):
+            await owner.step(session, 4)
+        assert (await owner.open(seed=0))[0] == session
+        await owner.step(session, 4)
+
+        await owner.close()
+        await other.close()
+        await server.close()
+
+    asyncio.run(run())
+
+
+def test_server_batches_in_order() -> None:
+    """Test one batch holding many requests per session applies them in order.
+
+    This test performs the following checks:
+
+    1. Repeated requests for a session in one batch give ChaseEnv's results.
+    2. Requests from another connection for the session are rejected.
+    """
+    server = ChaseServer(max_sessions=4)
+    env = ChaseEnv(obs_mode="array")
+    rng = np.random.default_rng(0)
+    for e in tqdm(range(BATCHES), desc="Batches"):
+        opened = np.zeros(1, dtype=REQUEST_DTYPE)
+        opened["op"], opened["arg"] = OPEN, e
+        session = server.process(opened, np.zeros(1))["session"][0]
+        env.reset(seed=e)
+
+        requests = np.zeros(12, dtype=REQUEST_DTYPE)
+        requests["op"], requests["session"] = STEP, session
+        requests["arg"] = rng.integers(9, size=12)
+        conns = np.zeros(12)
+        conns[5] = 1
+        responses = server.process(requests, conns)
+        assert responses["status"][5] == UNKNOWN_SESSION
+        for i in np.flatnonzero(conns == 0):
+            expected, reward, terminated, _, _ = env.step(int(requests["arg"][i]))
+            assert responses["reward"][i] == reward
+            assert responses["terminated"][i] == terminated
+            assert np.array_equal(responses["agent"][i], expected["agent"])
+            if terminated:
+                break
+        server.close_sessions(0)
@@ -0,0 +1,115 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+from tqdm import tqdm
+
+from gym_chase.arena_bank import build_bank
+from gym_chase.envs import ChaseEnv
+from gym_chase.envs.chase_core import arena_keys, generate_arenas, stream_key
+
+# Unseeded resets compared between envs.
+EPISODES = 200
+
+
+def test_episode_streams() -> None:
+    """Test unseeded resets follow reproducible per env streams.
+
+    This test performs the following checks:
+
+    1. stream_key gives the same keys as arena_keys.
+    2. Unseeded resets after reset(seed=s) repeat exactly in another env.
+    3. Other envs resetting and draws from np_random in between change nothing.
+    4. Envs that were never seeded start different streams.
+    5. np_random after reset(seed=s) draws as if gymnasium had reseeded it.
+    """
+    seeds = np.r_[np.arange(100), 2**62, 2**63 - 1]
+    assert arena_keys(seeds, seeds * 3).tolist() == [
+        stream_key(int(seed), int(seed) * 3) for seed in seeds
+    ]
+
+    env, again, other = ChaseEnv(), ChaseEnv(), ChaseEnv()
+    first, _ = env.reset(seed=11)
+    assert np.array_equal(again.reset(seed=11)[0]["agent"], first["agent"])
+    for _ in tqdm(range(EPISODES), desc="Unseeded resets"):
+        expected, _ = env.reset()
+        other.reset()
+        again.np_random.random()
+        observation, _ = again.reset()
+        assert np.array_equal(observation["agent"], expected["agent"])
+        for r in expected["robots"]:
+            assert np.array_equal(
+                observation["robots"][r]["location"],
+                expected["robots"][r]["location"],
+            )
+
+    starts = {tuple(ChaseEnv().reset()[0]["agent"]) for _ in range(20)}
+    assert len(starts) > 1, "Unseeded envs share a stream."
+
+    env.reset(seed=3)
+    env.reset(seed=5)
+    expected = np.random.default_rng(5).integers(2**63, size=4)
+    assert np.array_equal(env.np_random.integers(2**63, size=4), expected)
+
+
+def test_reset_many(tmp_path) -> None:
+    """Test reset_many gives the arenas of reset(seed=s) for every seed.
+
+    This test performs the following checks:
+
+    1. reset_many matches ChaseEnv.reset(seed=s) with "array" observations.
+    2. The same holds with an arena bank, for seeds in and past the bank.
+    3. The result can be projected with project_all_batch.
+
+    Args:
+        tmp_path: Directory for the arena bank.
+    """
+    seeds = [0, 5, 3, 999, 40, 41, 7]
+    path = str(tmp_path / "arenas.npy")
+    build_bank(path, 50, workers=1)
+    for env in [
+        ChaseEnv(obs_mode="array"),
+        ChaseEnv(obs_mode="array", arena_bank=path),
+    ]:
+        states = env.reset_many(seeds)
+        for i, seed in enumerate(seeds):
+            expected, _ = env.reset(seed=seed)
+            for key in ["agent", "robots", "zappers"]:
+                assert np.array_equal(states[key][i], expected[key]), f"{key} differs."
+        successors, rewards, terminated = env.project_all_batch(states)
+        assert rewards.shape == (len(seeds), 9)
+
+
+@pytest.mark.parametrize(
+    "size, robots, zappers", [(5, 2, 4), (20, 5, 10), (256, 800, 1600)]
+)
+def test_generate_arenas(size: int, robots: int, zappers: int) -> None:
+    """Test batches of arenas are valid and cost memory by pieces, not area.
+
+    This test performs the following checks:
+
+    1. Every zapper, robot and the agent is on its own interior square.
+    2. An arena is the same generated alone or in a batch.
+    3. Working memory beyond the arenas returned stays under 16 MB.
+
+    Args:
+        size: Arena size.
+        robots: Number of robots.
+        zappers: Number of zappers.
+    """
+    keys = arena_keys(np.arange(300))
+    tracemalloc.start()
+    agents, robot_squares, zapper_squares = generate_arenas(keys, size, robots, zappers)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    pieces = np.concatenate([zapper_squares, robot_squares, agents[:, None]], axis=1)
+    assert peak - pieces.nbytes < 16 * 2**20, "Batch memory grows with the area."
+
+    assert ((pieces > 0) & (pieces < size - 1)).all(), "Square outside the interior."
+    cells = np.sort(pieces[..., 0] * size + pieces[..., 1], axis=1)
+    assert (cells[:, 1:] != cells[:, :-1]).all(), "Squares are not distinct."
+    for i in tqdm(range(0, 300, 37), desc="Single arenas"):
+        alone = generate_arenas(keys[i : i + 1], size, robots, zappers)
+        assert np.array_equal(alone[0][0], agents[i]), "Agent differs."
+        assert np.array_equal(alone[1][0], robot_squares[i]), "Robots differ."
+        assert np.array_equal(alone[2][0], zapper_squares[i]), "Zappers differ."